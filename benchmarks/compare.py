@@ -0,0 +1,53 @@
+from typing import Dict, Any, List
+
+import json
+
+def load_thresholds(path: str) -> Dict[str, float]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _change_pct(baseline: float, current: float) -> float:
+    if baseline == 0:
+        return 0.0
+    return (current - baseline) / baseline * 100
+
+def find_errors(current: Dict[str, Any], thresholds: Dict[str, float]) -> List[str]:
+    """Routes whose share of non-2xx responses is above max_error_rate_pct (0 unless configured)"""
+    failures: List[str] = []
+    limit = thresholds.get("max_error_rate_pct", 0)
+    for level, routes in current.get("endpoints", {}).items():
+        for route, now in routes.items():
+            if now["error_rate"] * 100 > limit:
+                failures.append(
+                    f"{route} @c={level}: {now['errors']}/{now['requests']} non-2xx responses {now['statuses']}"
+                )
+    return failures
+
+def find_regressions(baseline: Dict[str, Any], current: Dict[str, Any], thresholds: Dict[str, float]) -> List[str]:
+    """Human-readable regressions of `current` against `baseline`, empty when within thresholds"""
+    regressions: List[str] = []
+    for level, routes in current.get("endpoints", {}).items():
+        for route, now in routes.items():
+            before = baseline.get("endpoints", {}).get(level, {}).get(route)
+            if before is None:
+                continue
+            drop = -_change_pct(before["throughput_rps"], now["throughput_rps"])
+            if drop > thresholds["throughput_drop_pct"]:
+                regressions.append(
+                    f"{route} @c={level}: throughput {before['throughput_rps']} -> {now['throughput_rps']} rps (-{drop:.1f}%)"
+                )
+            for quantile in ("p50_ms", "p95_ms", "p99_ms"):
+                rise = _change_pct(before[quantile], now[quantile])
+                if rise > thresholds[f"{quantile[:-3]}_increase_pct"]:
+                    regressions.append(
+                        f"{route} @c={level}: {quantile} {before[quantile]} -> {now[quantile]} (+{rise:.1f}%)"
+                    )
+
+    for name, now in current.get("micro", {}).items():
+        before = baseline.get("micro", {}).get(name)
+        if before is None:
+            continue
+        rise = _change_pct(before["ns_per_op"], now["ns_per_op"])
+        if rise > thresholds["micro_increase_pct"]:
+            regressions.append(f"{name}: {before['ns_per_op']} -> {now['ns_per_op']} ns/op (+{rise:.1f}%)")
+    return regressions
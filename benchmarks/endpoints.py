@@ -0,0 +1,74 @@
+from typing import List, Dict, Any, Callable, Awaitable, Tuple
+
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.stats import summarize
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+async def _drive(client: httpx.AsyncClient, request: Request, total: int, concurrency: int) -> Dict[str, Any]:
+    """Run `total` requests with `concurrency` workers pulling indexes from a shared counter"""
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < total:
+            index = next_index
+            next_index += 1
+            started = time.perf_counter()
+            response = await request(client, index)
+            if response.is_success:
+                latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, statuses)
+
+async def _level(client: httpx.AsyncClient, concurrency: int, total: int) -> Dict[str, Any]:
+    tokens: List[str] = [""] * total
+    #usernames must be 8-15 characters and unique across levels
+    prefix = f"b{concurrency:03d}"
+
+    async def add_user(c: httpx.AsyncClient, i: int) -> httpx.Response:
+        response = await c.post("/auth/add-user", json={"username": f"{prefix}{i:07d}", "password": "secret123"})
+        if response.status_code == 201:
+            tokens[i] = response.json()["access_token"]
+        return response
+
+    def auth(i: int) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {tokens[i % total]}"}
+
+    async def add_profile(c: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await c.post("/auth/add-profile", json={"age": 30, "name": "Alice", "city": "Berlin"}, headers=auth(i))
+
+    async def add_post(c: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await c.post("/auth/add-post", json={"title": f"post {i}", "content": "benchmark content " * 4}, headers=auth(i))
+
+    async def get_posts(c: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await c.get("/auth/get-user-posts-by-id", params={"limit": 20}, headers=auth(i))
+
+    routes: List[Tuple[str, Request]] = [
+        ("POST /auth/add-user", add_user),
+        ("POST /auth/add-profile", add_profile),
+        ("POST /auth/add-post", add_post),
+        ("GET /auth/get-user-posts-by-id", get_posts),
+    ]
+    return {name: await _drive(client, request, total, concurrency) for name, request in routes}
+
+async def run_endpoints(concurrency_levels: List[int], requests_per_level: int) -> Dict[str, Any]:
+    """Drive the /auth routes in-process; the environment must already point at a scratch database"""
+    from src.app.main import app
+
+    results: Dict[str, Any] = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for concurrency in concurrency_levels:
+                results[str(concurrency)] = await _level(client, concurrency, requests_per_level)
+    return results
@@ -0,0 +1,65 @@
+from typing import Dict, Any, Callable
+
+import asyncio
+import timeit
+
+from src.domain.user.value_object import UserID, Name, Hash, NameProfile, Age, City, Title, Content, Status
+from src.domain.user.entities import User, Profile, Posts
+from src.domain.user.batches import PostBatch
+
+#constant-time hasher so User.register measures the factory, not argon2
+class _NullHasher:
+    async def hash(self, password: str) -> str:
+        return "$argon2id$null"
+
+    async def verify(self, hashed: str, password: str) -> bool:
+        return True
+
+    async def dummy_hash(self) -> str:
+        return "$argon2id$null"
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return False
+
+def _register_user(loop: asyncio.AbstractEventLoop, hasher: _NullHasher) -> Callable[[], Any]:
+    return lambda: loop.run_until_complete(User.register("benchuser01", "secret123", hasher))
+
+def run_micro(number: int = 20000, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """Best-of-`repeat` nanoseconds per call for the value objects and entity factories"""
+    user_id = UserID.generate()
+    batch_size = 1000
+    batch_columns = (
+        [str(user_id.value)] * batch_size,
+        [f"Benchmark title {i}" for i in range(batch_size)],
+        ["Benchmark content"] * batch_size,
+    )
+    loop = asyncio.new_event_loop()
+    cases: Dict[str, Callable[[], Any]] = {
+        "UserID.generate": UserID.generate,
+        "Name.create": lambda: Name.create("benchuser01"),
+        "Hash.validate_plain": lambda: Hash.validate_plain("secret123"),
+        "NameProfile.create": lambda: NameProfile.create("Alice"),
+        "Age.create": lambda: Age.create(30),
+        "City.create": lambda: City.create("Berlin"),
+        "Title.create": lambda: Title.create("Benchmark title"),
+        "Content.create": lambda: Content.create("Benchmark content " * 8),
+        "Status.draft": Status.draft,
+        "Profile.create": lambda: Profile.create(user_id, 30, "Alice", "Berlin"),
+        "Posts.create": lambda: Posts.create("Benchmark title", "Benchmark content", user_id),
+        #whole-column validation, reported per row for comparison with Posts.create
+        "PostBatch.create/row": lambda: PostBatch.create(*batch_columns),
+        #includes one event loop round trip per call
+        "User.register": _register_user(loop, _NullHasher()),
+    }
+    results = {}
+    try:
+        for name, func in cases.items():
+            calls = number // 10 if name == "User.register" else number
+            rows = 1
+            if name == "PostBatch.create/row":
+                calls, rows = max(1, number // batch_size), batch_size
+            best = min(timeit.repeat(func, number=calls, repeat=repeat))
+            results[name] = {"ns_per_op": round(best / (calls * rows) * 1e9, 1), "calls": calls}
+    finally:
+        loop.close()
+    return results
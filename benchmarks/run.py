@@ -0,0 +1,125 @@
+"""Endpoint and domain micro-benchmarks.
+
+    python -m benchmarks.run --argon fast --concurrency 1,8,32 --requests 200
+    python -m benchmarks.run --argon production --requests 40 --baseline benchmarks/baseline/production.json
+
+`--argon fast` drops Argon2 to its minimum cost so the numbers are DB-bound;
+`--argon production` keeps the configured cost so they are hashing-bound.
+Results are written as JSON. Only 2xx responses count toward throughput and
+latency; the run exits non-zero when a route's error rate is above
+max_error_rate_pct in benchmarks/thresholds.json, and, with --baseline, when a
+metric regresses past the other thresholds. Commit a baseline with
+--save-baseline to make changes visible in review.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Any
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ARGON_PROFILES: Dict[str, Dict[str, str]] = {
+    #argon2 floor: one pass over 8 KiB per lane
+    "fast": {"ARGON_TIME_COST": "1", "ARGON_MEMORY_COST": "8", "ARGON_PARALLELISM": "1"},
+    #whatever ARGON_* the environment already configures, defaulting to the app's own
+    "production": {},
+}
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="register-users benchmarks")
+    parser.add_argument("--argon", choices=sorted(ARGON_PROFILES), default="fast")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="requests per route per level")
+    parser.add_argument("--skip-endpoints", action="store_true")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--output", help="result file, defaults to benchmarks/results/<argon>-<timestamp>.json")
+    parser.add_argument("--baseline", help="result file to compare against")
+    parser.add_argument("--thresholds", default=os.path.join(BENCH_DIR, "thresholds.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="also write benchmarks/baseline/<argon>.json")
+    return parser.parse_args()
+
+def _configure_environment(args: argparse.Namespace, workdir: str) -> None:
+    #must run before anything under src/ is imported: the singletons read env on first use
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    #the suite is one client hammering the routes, which the limiter would throttle
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+    os.environ.update(ARGON_PROFILES[args.argon])
+
+def _write(path: str, result: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"results written to {path}")
+
+def _print_summary(result: Dict[str, Any]) -> None:
+    for level, routes in result.get("endpoints", {}).items():
+        for route, row in routes.items():
+            print(
+                f"c={level:>3} {route:<34} {row['throughput_rps']:>10.1f} rps  "
+                f"p50 {row['p50_ms']:>8.2f}  p95 {row['p95_ms']:>8.2f}  p99 {row['p99_ms']:>8.2f} ms  "
+                f"errors {row['errors']:>5}  {row['statuses']}"
+            )
+    for name, row in result.get("micro", {}).items():
+        print(f"{name:<22} {row['ns_per_op']:>10.1f} ns/op")
+
+def main() -> int:
+    args = _parse_args()
+    levels = [int(level) for level in args.concurrency.split(",") if level]
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        _configure_environment(args, workdir)
+        from benchmarks.endpoints import run_endpoints
+        from benchmarks.micro import run_micro
+        from benchmarks.compare import load_thresholds, find_regressions, find_errors
+
+        result: Dict[str, Any] = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "argon": args.argon,
+                "argon_env": {k: v for k, v in os.environ.items() if k.startswith("ARGON_")},
+                "concurrency": levels,
+                "requests_per_level": args.requests,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+        }
+        if not args.skip_endpoints:
+            result["endpoints"] = asyncio.run(run_endpoints(levels, args.requests))
+        if not args.skip_micro:
+            result["micro"] = run_micro()
+
+    _print_summary(result)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    _write(args.output or os.path.join(BENCH_DIR, "results", f"{args.argon}-{stamp}.json"), result)
+    if args.save_baseline:
+        _write(os.path.join(BENCH_DIR, "baseline", f"{args.argon}.json"), result)
+
+    thresholds = load_thresholds(args.thresholds)
+    #a run that errored measured the error path, so its numbers are not comparable
+    errors = find_errors(result, thresholds)
+    for line in errors:
+        print(f"ERRORS {line}")
+    if errors:
+        return 1
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(baseline, result, thresholds)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("no regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+from typing import List, Dict, Any
+
+import math
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def summarize(latencies: List[float], elapsed: float, statuses: Dict[int, int]) -> Dict[str, Any]:
+    """`latencies` holds the 2xx responses only; every other status is counted as an error
+    and kept out of throughput and the percentiles"""
+    ordered = sorted(latencies)
+    requests = sum(statuses.values())
+    errors = sum(count for code, count in statuses.items() if not 200 <= code < 300)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "error_rate": round(errors / requests, 6) if requests else 0.0,
+        "elapsed_seconds": round(elapsed, 6),
+        "throughput_rps": round(len(ordered) / elapsed, 3) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+    }
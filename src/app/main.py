@@ -2,22 +2,58 @@ from fastapi import FastAPI
 from fastapi.security import HTTPBearer
 from contextlib import asynccontextmanager
 
-from src.presentation.api.deps import get_db_config
+import asyncio
+import os
+
+from src.presentation.api.deps import get_db_config, get_argon_config, get_username_filter, get_outbox_dispatcher, get_authx_service, get_readiness
 from src.infrastructure.log.logger import logger
-from src.presentation.api.routers import auth
+from src.application.auth.handle import drain_background_tasks
+from src.presentation.api.routers import auth, system, metrics
+from src.presentation.api.middleware import MetricsMiddleware, RateLimitHeadersMiddleware
 
+#STARTUP_MODE=fast checks the stored schema version instead of running create_all;
+#either way every lazy resource is built before the worker reports ready
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     db = get_db_config()
+    hasher = get_argon_config()
+    dispatcher = get_outbox_dispatcher()
+    readiness = get_readiness()
+    authx = get_authx_service()
     try:
-        await db.connect()
+        async with readiness.phase("db.connect"):
+            await db.connect(mode=os.getenv("STARTUP_MODE", "full"))
+        async with readiness.phase("db.warm_pool"):
+            await db.warm_pool(int(os.getenv("DB_WARM_CONNECTIONS", 1)))
+        async with readiness.phase("username_filter.load"):
+            await get_username_filter().load(db.read_session)
+        async with readiness.phase("hasher.start"):
+            await hasher.start()
+        async with readiness.phase("authx.warm"):
+            authx.warm()
+        async with readiness.phase("denylist.load"):
+            await authx.denylist.load()
+        authx.denylist.start()
+        dispatcher.start()
+        readiness.mark_ready()
         yield
     except Exception as e:
         logger.exception(f"Asynccontextmanager error: {e}")
         raise
     finally:
+        readiness.mark_draining()
+        #rehash-on-login tasks still need the hashing pool
+        await drain_background_tasks(float(os.getenv("BACKGROUND_DRAIN_TIMEOUT", 10)))
+        await authx.denylist.stop()
+        await dispatcher.stop()
+        #waits for in-flight argon2 jobs; off the loop so the remaining tasks keep running meanwhile
+        await asyncio.to_thread(hasher.shutdown)
         await db.disconnect()
 
 bearer = HTTPBearer()
 app = FastAPI(title="FastAPI DDD Template", lifespan=lifespan)
-app.include_router(auth.router)
\ No newline at end of file
+app.include_router(auth.router)
+app.include_router(system.router)
+app.include_router(metrics.router)
+app.add_middleware(RateLimitHeadersMiddleware)
+app.add_middleware(MetricsMiddleware)
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""Admin command: rebuild the posts full-text index from scratch.
+
+    python -m src.app.rebuild_search_index --batch-size 5000
+
+Safe to run next to live workers: each batch is its own short write transaction,
+and posts written meanwhile are indexed by the triggers. Searches see a partial
+index until it finishes.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from src.infrastructure.db.session import DataBaseConfig
+from src.infrastructure.db.repository.search_repository import PostSearchRepository
+from src.infrastructure.log.logger import logger
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="rebuild the posts full-text index")
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("SEARCH_REBUILD_BATCH_SIZE", 5000)))
+    return parser.parse_args()
+
+async def rebuild(batch_size: int) -> int:
+    db = DataBaseConfig()
+    try:
+        #"fast" still creates the index and triggers when the schema version is behind
+        await db.connect(mode="fast")
+        started = time.perf_counter()
+        indexed = await PostSearchRepository(db.async_session).rebuild(batch_size=batch_size)
+        logger.info(f"search index rebuilt: {indexed} posts in {time.perf_counter() - started:.2f}s")
+        return indexed
+    finally:
+        await db.disconnect()
+
+def main() -> None:
+    args = _parse_args()
+    asyncio.run(rebuild(max(1, args.batch_size)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Production entry point: N uvicorn worker processes sharing one listen socket.
+
+    python -m src.app.serve --workers 4 --host 0.0.0.0 --port 8000
+
+The supervisor creates/verifies the schema once, binds the socket, then spawns
+workers. Each worker is a fresh interpreter (spawn), so the lru_cache singletons
+in deps.py -- engine, argon pool, authx -- are built per worker, with the schema
+step reduced to the STARTUP_MODE=fast version check. SIGTERM/SIGINT drain every
+worker gracefully. Workers that die unexpectedly are replaced with exponential
+backoff; a slot whose worker keeps dying within --restart-window of starting
+makes the supervisor give up after --max-restarts tries and exit 1. On its first signal
+a worker reports "draining" (503) from /system/ready and keeps serving for
+--drain-delay seconds, so the load balancer can take it out before it stops
+accepting; a second signal skips the wait.
+
+Per-process state is kept consistent across workers: Argon2 calibration runs
+once here and reaches the workers as fixed parameters; the username filter and
+posts cache, which only see their own worker's writes, are switched off; rate
+limits are split between the workers; the outbox is leased row by row.
+"""
+from multiprocessing.context import SpawnProcess
+from types import FrameType
+from typing import List, Optional
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from src.infrastructure.db.session import DataBaseConfig
+from src.infrastructure.security.argon_config import ArgonHashConfig
+from src.infrastructure.log.logger import logger
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="multi-process server")
+    parser.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_WORKERS", os.cpu_count() or 1)))
+    parser.add_argument("--backlog", type=int, default=int(os.getenv("WEB_BACKLOG", 2048)))
+    parser.add_argument("--graceful-timeout", type=float, default=float(os.getenv("WEB_GRACEFUL_TIMEOUT", 30)))
+    parser.add_argument("--drain-delay", type=float, default=float(os.getenv("WEB_DRAIN_DELAY", 5)))
+    parser.add_argument("--max-restarts", type=int, default=int(os.getenv("WEB_MAX_RESTARTS", 5)))
+    parser.add_argument("--restart-window", type=float, default=float(os.getenv("WEB_RESTART_WINDOW", 60)))
+    return parser.parse_args()
+
+async def _prepare_schema() -> None:
+    #one process creates the schema; workers only compare the stored fingerprint
+    db = DataBaseConfig()
+    try:
+        await db.connect(mode=os.getenv("STARTUP_MODE", "full"))
+    finally:
+        await db.disconnect()
+
+def _share_process_state(workers: int) -> None:
+    #spawned workers inherit os.environ as it is when they start
+    if os.getenv("ARGON_CALIBRATE", "0") == "1":
+        params = ArgonHashConfig().calibrate_from_env()
+        os.environ.update(
+            ARGON_TIME_COST=str(params["time_cost"]),
+            ARGON_MEMORY_COST=str(params["memory_cost"]),
+            ARGON_CALIBRATE="0",
+        )
+    if workers > 1:
+        #a filter miss or a cache hit can be stale when another worker did the write
+        os.environ.setdefault("USERNAME_FILTER_ENABLED", "0")
+        os.environ.setdefault("POSTS_CACHE_ENABLED", "0")
+        os.environ.setdefault("RATE_LIMIT_WORKERS", str(workers))
+
+def _bind(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+#uvicorn closes the listener as soon as it handles a signal, which is too late for a
+#readiness 503 to be seen; this flips readiness first and hands the signal on after the delay
+class DrainingServer(uvicorn.Server):
+    def __init__(self, config: uvicorn.Config, drain_delay: float) -> None:
+        super().__init__(config)
+        self._drain_delay = drain_delay
+        self._drain_until: Optional[float] = None
+        self._pending_signal: Optional[int] = None
+
+    def handle_exit(self, sig: int, frame: Optional[FrameType]) -> None:
+        #the app is loaded by the time a signal can arrive, so this is the worker's own singleton
+        from src.presentation.api.deps import get_readiness
+        get_readiness().mark_draining()
+        if self._drain_until is None and self._drain_delay > 0:
+            self._drain_until = time.monotonic() + self._drain_delay
+            self._pending_signal = sig
+            return
+        self._pending_signal = None
+        super().handle_exit(sig, frame)
+
+    async def on_tick(self, counter: int) -> bool:
+        if self._pending_signal is not None and time.monotonic() >= self._drain_until:
+            sig, self._pending_signal = self._pending_signal, None
+            super().handle_exit(sig, None)
+        return await super().on_tick(counter)
+
+def _run_worker(sock: socket.socket, graceful_timeout: float, drain_delay: float) -> None:
+    #runs in the spawned child, before anything under src.app.main is imported
+    os.environ["STARTUP_MODE"] = "fast"
+    config = uvicorn.Config(
+        "src.app.main:app",
+        lifespan="on",
+        log_config=None,
+        timeout_graceful_shutdown=graceful_timeout,
+    )
+    DrainingServer(config, drain_delay).run(sockets=[sock])
+
+#restart delay after a worker died: doubles per consecutive failure of the slot, up to the cap
+RESTART_BACKOFF_BASE, RESTART_BACKOFF_MAX = 0.5, 30.0
+
+class Supervisor:
+    def __init__(
+            self,
+            sock: socket.socket,
+            workers: int,
+            graceful_timeout: float,
+            drain_delay: float = 0.0,
+            max_restarts: int = 5,
+            restart_window: float = 60.0,
+    ) -> None:
+        self._sock = sock
+        self._workers = workers
+        self._graceful_timeout = graceful_timeout
+        self._drain_delay = drain_delay
+        self._max_restarts = max_restarts
+        self._restart_window = restart_window
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: List[Optional[SpawnProcess]] = [None] * workers
+        self._started_at: List[float] = [0.0] * workers
+        self._respawn_at: List[Optional[float]] = [None] * workers
+        #consecutive deaths per slot within restart_window of starting; a longer-lived worker resets it
+        self._failures: List[int] = [0] * workers
+        self._stopping = False
+        self._exit_code = 0
+
+    def _spawn(self, slot: int) -> None:
+        process = self._context.Process(
+            target=_run_worker, args=(self._sock, self._graceful_timeout, self._drain_delay),
+            name=f"worker-{slot}", daemon=False,
+        )
+        process.start()
+        self._processes[slot] = process
+        self._started_at[slot] = time.monotonic()
+        self._respawn_at[slot] = None
+        logger.info(f"worker-{slot} started (pid {process.pid})")
+
+    def _on_exit(self, slot: int, process: SpawnProcess, now: float) -> None:
+        uptime = now - self._started_at[slot]
+        self._failures[slot] = self._failures[slot] + 1 if uptime < self._restart_window else 1
+        self._processes[slot] = None
+        if self._failures[slot] > self._max_restarts:
+            logger.error(
+                f"worker-{slot} exited with code {process.exitcode} after {uptime:.1f}s, "
+                f"{self._failures[slot]} failures in a row, giving up"
+            )
+            self._exit_code = 1
+            self._stopping = True
+            return
+        delay = min(RESTART_BACKOFF_MAX, RESTART_BACKOFF_BASE * 2 ** (self._failures[slot] - 1))
+        logger.warning(
+            f"worker-{slot} exited with code {process.exitcode} after {uptime:.1f}s, restarting in {delay:.1f}s"
+        )
+        self._respawn_at[slot] = now + delay
+
+    def _request_stop(self, signum: int, frame) -> None:
+        if not self._stopping:
+            logger.info(f"received {signal.Signals(signum).name}, draining {self._workers} workers")
+        self._stopping = True
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        for slot in range(self._workers):
+            self._spawn(slot)
+
+        while not self._stopping:
+            time.sleep(0.5)
+            now = time.monotonic()
+            for slot, process in enumerate(self._processes):
+                if self._stopping:
+                    break
+                if process is not None and not process.is_alive():
+                    self._on_exit(slot, process, now)
+                elif process is None and self._respawn_at[slot] is not None and now >= self._respawn_at[slot]:
+                    self._spawn(slot)
+        self._drain()
+        return self._exit_code
+
+    def _drain(self) -> None:
+        alive = [process for process in self._processes if process is not None and process.is_alive()]
+        for process in alive:
+            #SIGTERM: report draining, then stop accepting, finish in-flight requests, run lifespan shutdown
+            process.terminate()
+        deadline = time.monotonic() + self._drain_delay + self._graceful_timeout + 5
+        for process in alive:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"{process.name} did not drain in time, killing")
+                process.kill()
+                process.join()
+        self._sock.close()
+        logger.info("all workers stopped")
+
+def main() -> int:
+    args = _parse_args()
+    workers = max(1, args.workers)
+    #split the cores between the workers' argon pools instead of each taking all of them
+    os.environ.setdefault("ARGON_MAX_WORKERS", str(max(1, (os.cpu_count() or 1) // workers)))
+
+    _share_process_state(workers)
+    asyncio.run(_prepare_schema())
+    sock = _bind(args.host, args.port, args.backlog)
+    logger.info(f"listening on {args.host}:{args.port} with {workers} workers")
+    return Supervisor(
+        sock, workers, args.graceful_timeout, args.drain_delay,
+        max_restarts=max(0, args.max_restarts), restart_window=args.restart_window,
+    ).run()
+
+if __name__ == "__main__":
+    sys.exit(main())
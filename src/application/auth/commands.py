@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import List, Iterable, AsyncIterable, Union
 
 @dataclass(frozen=True)
 class UserRegisteredCommand:
@@ -18,4 +19,26 @@ class PostRegisteredcommand:
 
 @dataclass(frozen=True)
 class PostsGetCommand:
-    user_id: str
\ No newline at end of file
+    user_id: str
+
+@dataclass(frozen=True)
+class UserLoginCommand:
+    username: str
+    password: str
+
+@dataclass(frozen=True)
+class UsersBulkRegisteredCommand:
+    users: List[UserRegisteredCommand]
+    return_tokens: bool = False
+
+@dataclass(frozen=True)
+class PostIngestItem:
+    user_id: str
+    title: str
+    content: str
+
+@dataclass(frozen=True)
+class PostsIngestCommand:
+    posts: Union[Iterable[PostIngestItem], AsyncIterable[PostIngestItem]]
+    chunk_size: int = 1000
+    resume_from: int = 0
\ No newline at end of file
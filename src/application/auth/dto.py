@@ -1,10 +1,19 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Dict
 
 @dataclass
 class AuthResultDTO:
     status: str
     message: str
     access_token: str
+    refresh_token: Optional[str] = None
+
+@dataclass
+class LogoutResultDTO:
+    status: str
+    message: str
+    revoked: int
 
 @dataclass
 class AuthProfileResultDTO:
@@ -16,3 +25,51 @@ class AuthPostResultDTO:
     status: str
     message: str
 
+@dataclass
+class ProfileOverviewDTO:
+    age: int
+    name: str
+    city: str
+
+@dataclass
+class UserOverviewDTO:
+    user_id: str
+    username: str
+    created_at: datetime
+    profile: Optional[ProfileOverviewDTO]
+    post_counts: Dict[str, int]
+    posts_total: int
+
+@dataclass
+class AuthBulkRowResultDTO:
+    index: int
+    username: str
+    status: str
+    message: str
+    user_id: Optional[str] = None
+    access_token: Optional[str] = None
+
+@dataclass
+class AuthBulkResultDTO:
+    status: str
+    created: int
+    failed: int
+    results: List[AuthBulkRowResultDTO] = field(default_factory=list)
+
+@dataclass
+class PostIngestErrorDTO:
+    index: int
+    message: str
+
+@dataclass
+class PostIngestReportDTO:
+    status: str
+    processed: int
+    inserted: int
+    rejected: int
+    chunks: int
+    checkpoint: int
+    elapsed_seconds: float
+    rows_per_second: float
+    errors: List[PostIngestErrorDTO] = field(default_factory=list)
+    message: Optional[str] = None
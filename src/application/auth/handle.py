@@ -1,11 +1,41 @@
-from src.application.auth.commands import UserRegisteredCommand, ProfileRegisteredCommand, PostRegisteredcommand
-from src.application.auth.dto import AuthResultDTO, AuthProfileResultDTO, AuthPostResultDTO
+from src.application.auth.commands import UserRegisteredCommand, ProfileRegisteredCommand, PostRegisteredcommand, UserLoginCommand, UsersBulkRegisteredCommand, PostsIngestCommand, PostIngestItem
+from src.application.auth.dto import AuthResultDTO, AuthProfileResultDTO, AuthPostResultDTO, AuthBulkResultDTO, AuthBulkRowResultDTO, PostIngestReportDTO, PostIngestErrorDTO, LogoutResultDTO, UserOverviewDTO, ProfileOverviewDTO
 
-from src.domain.user.value_object import UserID
+from src.domain.user.value_object import UserID, Name, Hash, STATUSES
+from src.domain.user.exceptions import UserAlreadyExistsError, InvalidCredentialsError, UserNotFoundError, RefreshTokenReuseError
 from src.domain.protocols.authx_service_protocol import AuthxServiceProtocol
 from src.domain.protocols.argon_config_protocol import ArgonConfigProtocol
 from src.domain.protocols.user_repository_protocol import UserRepositoryProtocol
 from src.domain.user.entities import User, Profile, Posts
+from src.domain.user.batches import UserBatch, PostBatch
+from src.infrastructure.log.logger import logger
+
+from typing import Coroutine, Any, Set, Dict, List, Iterable, AsyncIterable, AsyncIterator, Awaitable, Callable, Optional, Union
+
+import asyncio
+import time
+
+#strong references to fire-and-forget work so it is not garbage collected mid-flight
+_background_tasks: Set[asyncio.Task] = set()
+
+def _run_in_background(coro: Coroutine[Any, Any, None]) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+async def drain_background_tasks(timeout: Optional[float] = None) -> None:
+    """Wait for pending fire-and-forget work (e.g. rehash-on-login); whatever is still running
+    after `timeout` is cancelled. Runs at shutdown, before the hasher it uses is closed"""
+    if not _background_tasks:
+        return
+    pending = list(_background_tasks)
+    _, still_running = await asyncio.wait(pending, timeout=timeout)
+    for task in still_running:
+        task.cancel()
+    if still_running:
+        await asyncio.gather(*still_running, return_exceptions=True)
+        logger.warning(f"{len(still_running)} background tasks cancelled at shutdown")
+    logger.info(f"{len(pending) - len(still_running)} background tasks drained")
 
 class RegisterUserHandle:
     def __init__(
@@ -20,25 +50,160 @@ class RegisterUserHandle:
     
     async def handle(self, cmd: UserRegisteredCommand) -> AuthResultDTO:
         try:
-            user = User.register(
+            #reject known duplicates before paying for the hash
+            username = Name.create(cmd.username)
+            if await self._repo.username_exists(username.value):
+                raise UserAlreadyExistsError(username.value)
+
+            user = await User.register(
                 raw_username=cmd.username,
                 plain_password=cmd.password,
                 hasher=self._hasher,
             )
             await self._repo.add_user(user)
 
+            #one family for the pair, so refresh-token reuse also revokes this access token
+            family = self._authx.new_token_family()
             access_token = self._authx.create_access_token(
-                uid=str(user.user_id.value),
+                uid=str(user.user_id.value), family=family,
             )
 
             return AuthResultDTO(
                 status="success",
                 message="The account has been successfully registered!",
                 access_token=access_token,
+                refresh_token=self._authx.create_refresh_token(uid=str(user.user_id.value), family=family),
+            )
+        except Exception:
+            raise
+    
+    async def bulk_handle(
+            self,
+            cmd: UsersBulkRegisteredCommand,
+            hash_concurrency: int = 8,
+            chunk_size: int = 500,
+    ) -> AuthBulkResultDTO:
+        results = [
+            AuthBulkRowResultDTO(index=i, username=row.username, status="pending", message="")
+            for i, row in enumerate(cmd.users)
+        ]
+
+        #validate every column before any hashing
+        passwords = [row.password for row in cmd.users]
+        usernames, errors = UserBatch.validate([row.username for row in cmd.users], passwords)
+
+        valid = {name: i for i, name in enumerate(usernames) if errors[i] is None}
+        for name in await self._repo.existing_usernames(valid.keys(), chunk_size=chunk_size):
+            errors[valid[name]] = str(UserAlreadyExistsError(name))
+
+        #hashing fan-out is bounded so the batch does not flood the hashing queue
+        batch = await UserBatch.register(usernames, passwords, errors, self._hasher, hash_concurrency)
+
+        created = 0
+        if len(batch):
+            try:
+                await self._repo.add_user_batch(batch, chunk_size=chunk_size)
+                created = len(batch)
+            except Exception as e:
+                for i in batch.source_index:
+                    errors[i] = f"Batch insert failed: {e}"
+
+        for i, error in enumerate(errors):
+            if usernames[i] is not None:
+                results[i].username = usernames[i]
+            if error is not None:
+                results[i].status, results[i].message = "error", error
+        if created:
+            for i, user_id in zip(batch.source_index, batch.user_ids):
+                results[i].status = "success"
+                results[i].message = "The account has been successfully registered!"
+                results[i].user_id = user_id
+                if cmd.return_tokens:
+                    results[i].access_token = self._authx.create_access_token(uid=user_id)
+
+        return AuthBulkResultDTO(
+            status="success" if created == len(results) else "partial" if created else "error",
+            created=created,
+            failed=len(results) - created,
+            results=results,
+        )
+    
+    async def login_handle(self, cmd: UserLoginCommand) -> AuthResultDTO:
+        try:
+            user = await self._repo.get_user_by_username(cmd.username.strip())
+            if user is None:
+                #same verify cost as a known username, so timing does not reveal which exist
+                await self._hasher.verify(await self._hasher.dummy_hash(), cmd.password)
+                raise InvalidCredentialsError()
+
+            password = Hash(user.password)
+            if not await password.verify(cmd.password, self._hasher):
+                raise InvalidCredentialsError()
+
+            #stored hash predates the current cost policy, upgrade it off the request path
+            if password.needs_rehash(self._hasher):
+                _run_in_background(self.rehash_handle(user.user_id, cmd.password))
+
+            family = self._authx.new_token_family()
+            access_token = self._authx.create_access_token(uid=user.user_id, family=family)
+
+            return AuthResultDTO(
+                status="success",
+                message="You have successfully logged in!",
+                access_token=access_token,
+                refresh_token=self._authx.create_refresh_token(uid=user.user_id, family=family),
             )
         except Exception:
             raise
     
+    async def refresh_handle(self, refresh_payload: Any) -> AuthResultDTO:
+        #rotation: the presented refresh token is spent, a new pair is issued in the same family.
+        #a token spent twice means it leaked, so the whole family is revoked instead
+        try:
+            if not await self._authx.revoke(refresh_payload):
+                await self._authx.revoke_family(refresh_payload)
+                logger.warning(f"refresh token reuse for user '{refresh_payload.sub}', token family revoked")
+                raise RefreshTokenReuseError()
+            family = self._authx.token_family(refresh_payload) or self._authx.new_token_family()
+            return AuthResultDTO(
+                status="success",
+                message="Tokens have been refreshed!",
+                access_token=self._authx.create_access_token(uid=refresh_payload.sub, family=family),
+                refresh_token=self._authx.create_refresh_token(uid=refresh_payload.sub, family=family),
+            )
+        except Exception:
+            raise
+    
+    async def logout_handle(self, access_payload: Any, refresh_token: Optional[str] = None) -> LogoutResultDTO:
+        try:
+            payloads = [access_payload]
+            if refresh_token is not None:
+                refresh_payload = self._authx.decode_refresh_token(refresh_token)
+                if refresh_payload.sub != access_payload.sub:
+                    raise ValueError("Refresh token belongs to another user")
+                payloads.append(refresh_payload)
+            for payload in payloads:
+                await self._authx.revoke(payload)
+
+            return LogoutResultDTO(
+                status="success",
+                message="You have been logged out!",
+                revoked=len(payloads),
+            )
+        except Exception:
+            raise
+    
+    async def rehash_handle(self, user_id: str, plain_password: str) -> None:
+        try:
+            password = await Hash.for_plain(plain_password, self._hasher)
+            await self._repo.update_password(user_id, password.value)
+        except Exception as e:
+            logger.warning(f"Password rehash for user '{user_id}' skipped: {e}")
+    
+    async def username_available_handle(self, username: str) -> bool:
+        name = Name.create(username)
+        return not await self._repo.username_exists(name.value)
+    
     async def profile_handle(self, cmd: ProfileRegisteredCommand, user_id: str) -> AuthProfileResultDTO:
         try:
             profile = Profile.create(
@@ -56,6 +221,24 @@ class RegisterUserHandle:
         except Exception:
             raise
     
+    async def me_handle(self, user_id: str) -> UserOverviewDTO:
+        overview = await self._repo.get_user_overview(user_id)
+        if overview is None:
+            raise UserNotFoundError(user_id)
+
+        #statuses without a counter row have no posts yet
+        post_counts = {status: 0 for status in sorted(STATUSES)}
+        post_counts.update(overview["post_counts"])
+        profile = overview["profile"]
+        return UserOverviewDTO(
+            user_id=overview["user_id"],
+            username=overview["username"],
+            created_at=overview["created_at"],
+            profile=ProfileOverviewDTO(**profile) if profile is not None else None,
+            post_counts=post_counts,
+            posts_total=sum(post_counts.values()),
+        )
+    
     async def posts_handle(self, cmd: PostRegisteredcommand, user_id: str) -> AuthProfileResultDTO:
         try:
             post = Posts.create(
@@ -70,4 +253,88 @@ class RegisterUserHandle:
                 message="Your post has been successfully added!",
             )
         except Exception:
-            raise
\ No newline at end of file
+            raise
+
+async def _aiter(source: Union[Iterable[PostIngestItem], AsyncIterable[PostIngestItem]]) -> AsyncIterator[PostIngestItem]:
+    if hasattr(source, "__aiter__"):
+        async for item in source:
+            yield item
+    else:
+        for item in source:
+            yield item
+
+#bulk post ingestion: validates each chunk column-wise into a PostBatch and
+#commits one transaction per chunk; `checkpoint` is the source position to resume from
+class IngestPostsHandle:
+    def __init__(
+            self,
+            repo: UserRepositoryProtocol,
+            max_errors: int = 1000,
+    ) -> None:
+        self._repo = repo
+        self._max_errors = max_errors
+
+    async def handle(
+            self,
+            cmd: PostsIngestCommand,
+            on_progress: Optional[Callable[[PostIngestReportDTO], Optional[Awaitable[None]]]] = None,
+    ) -> PostIngestReportDTO:
+        started = time.perf_counter()
+        report = PostIngestReportDTO(
+            status="success", processed=0, inserted=0, rejected=0, chunks=0,
+            checkpoint=cmd.resume_from, elapsed_seconds=0.0, rows_per_second=0.0,
+        )
+        user_ids: List[str] = []
+        titles: List[str] = []
+        contents: List[str] = []
+        position = 0
+
+        async def flush() -> None:
+            if user_ids:
+                batch = PostBatch.create(user_ids, titles, contents)
+                first = position - len(user_ids)
+                #counted only once the chunk is durable, so a resumed run does not report them twice
+                if len(batch):
+                    await self._repo.add_post_batch(batch)
+                    report.inserted += len(batch)
+                    report.chunks += 1
+                for i, error in batch.rejected:
+                    report.rejected += 1
+                    if len(report.errors) < self._max_errors:
+                        report.errors.append(PostIngestErrorDTO(index=first + i, message=error))
+                user_ids.clear()
+                titles.clear()
+                contents.clear()
+            report.checkpoint = position
+            report.elapsed_seconds = round(time.perf_counter() - started, 6)
+            report.rows_per_second = round(report.inserted / report.elapsed_seconds, 2) if report.elapsed_seconds else 0.0
+            logger.info(
+                f"post ingestion: {report.inserted} inserted, {report.rejected} rejected, "
+                f"checkpoint {report.checkpoint}, {report.rows_per_second} rows/s"
+            )
+            if on_progress is not None:
+                result = on_progress(report)
+                if asyncio.iscoroutine(result):
+                    await result
+
+        try:
+            async for item in _aiter(cmd.posts):
+                position += 1
+                if position <= cmd.resume_from:
+                    continue
+                report.processed += 1
+                user_ids.append(item.user_id)
+                titles.append(item.title)
+                contents.append(item.content)
+                if len(user_ids) >= cmd.chunk_size:
+                    await flush()
+            await flush()
+        except Exception as e:
+            #everything up to report.checkpoint is durable; the caller resumes from there
+            logger.exception(f"post ingestion interrupted at checkpoint {report.checkpoint}: {e}")
+            report.status = "interrupted"
+            report.message = str(e)
+            return report
+        if report.rejected:
+            report.status = "partial" if report.inserted else "error"
+        return report
\ No newline at end of file
@@ -0,0 +1,19 @@
+from typing import Dict, Any
+
+from src.infrastructure.log.logger import logger
+from src.infrastructure.messaging.outbox_dispatcher import OutboxDispatcher
+
+#side effects that used to be candidates for running inline; they now run off the
+#request path and may see the same event twice, so they must stay idempotent on event_id
+
+async def send_welcome_email(event: Dict[str, Any]) -> None:
+    logger.info(f"welcome email queued for user '{event['data']['user_id']}' (event {event['event_id']})")
+
+async def track_analytics(event: Dict[str, Any]) -> None:
+    logger.info(f"analytics: {event['event_type']} {event['data']} (event {event['event_id']})")
+
+def register_event_handlers(dispatcher: OutboxDispatcher) -> None:
+    dispatcher.register("UserRegisteredEvent", send_welcome_email)
+    dispatcher.register("UserRegisteredEvent", track_analytics)
+    dispatcher.register("UserProfileRegisteredEvent", track_analytics)
+    dispatcher.register("PostRegisteredEvent", track_analytics)
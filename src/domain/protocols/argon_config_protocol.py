@@ -1,5 +1,7 @@
 from typing import Protocol
 
 class ArgonConfigProtocol(Protocol):
-    def hash(self, password: str) -> str: ...
-    def verify(self, hashed: str, password: str) -> bool: ...
\ No newline at end of file
+    async def hash(self, password: str) -> str: ...
+    async def verify(self, hashed: str, password: str) -> bool: ...
+    async def dummy_hash(self) -> str: ...
+    def needs_rehash(self, hashed: str) -> bool: ...
\ No newline at end of file
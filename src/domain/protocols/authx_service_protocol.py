@@ -1,4 +1,10 @@
-from typing import Protocol
+from typing import Protocol, Any, Optional
 
 class AuthxServiceProtocol(Protocol):
-    def create_access_token(self, uid: str) -> str: ...
\ No newline at end of file
+    def create_access_token(self, uid: str, family: Optional[str] = None) -> str: ...
+    def create_refresh_token(self, uid: str, family: Optional[str] = None) -> str: ...
+    def decode_refresh_token(self, token: str) -> Any: ...
+    def token_family(self, payload: Any) -> Optional[str]: ...
+    def new_token_family(self) -> str: ...
+    async def revoke(self, payload: Any) -> bool: ...
+    async def revoke_family(self, payload: Any) -> None: ...
\ No newline at end of file
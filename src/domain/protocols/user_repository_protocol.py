@@ -1,10 +1,23 @@
-from typing import Protocol, Optional
+from typing import Protocol, Optional, Tuple, List, AsyncIterator, Dict, Any, Set, Iterable
 
 from src.domain.user.entities import User, Profile, Posts
-from src.infrastructure.db.models import UserPosts
+from src.domain.user.batches import UserBatch, PostBatch
+from src.infrastructure.db.models import UserModel
 
 class UserRepositoryProtocol(Protocol):
+    async def username_exists(self, username: str) -> bool: ...
+    async def existing_usernames(self, usernames: Iterable[str], chunk_size: int = 500) -> Set[str]: ...
+    async def get_user_by_username(self, username: str) -> Optional[UserModel]: ...
+    async def update_password(self, user_id: str, password: str) -> None: ...
     async def add_user(self, user: User) -> None: ...
+    async def add_user_batch(self, batch: UserBatch, chunk_size: int = 500) -> None: ...
     async def add_profile(self, profile: Profile) -> None: ...
     async def add_post(self, post: Posts) -> None: ...
-    async def get_user_post_by_id(self, user_id: str) -> list[UserPosts]: ...
\ No newline at end of file
+    async def add_post_batch(self, batch: PostBatch, chunk_size: int = 500) -> None: ...
+    async def get_user_overview(self, user_id: str) -> Optional[Dict[str, Any]]: ...
+    async def get_user_post_by_id(
+        self, user_id: str, limit: int = 50, cursor: Optional[str] = None, status: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]: ...
+    def stream_user_posts(
+        self, user_id: str, chunk_size: int = 500, status: Optional[str] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]: ...
\ No newline at end of file
@@ -0,0 +1,142 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Callable, Any, Iterator, Tuple
+from uuid import uuid4
+
+import asyncio
+
+from src.domain.protocols.argon_config_protocol import ArgonConfigProtocol
+from src.domain.user.value_object import UserID, Name, check_username, check_password, check_title, check_content
+from src.domain.events.domain_event import DomainEvent
+from src.domain.events.events import UserRegisteredEvent, PostRegisteredEvent
+
+#one slot per input row: None when the row is valid, else the first rule it failed
+RowErrors = List[Optional[str]]
+
+def validate_column(values: Sequence[Any], rule: Callable[[Any], Any], errors: RowErrors) -> List[Any]:
+    """Run a value object rule down a whole column; rows that already failed are skipped"""
+    normalized: List[Any] = [None] * len(values)
+    for i, value in enumerate(values):
+        if errors[i] is not None:
+            continue
+        try:
+            normalized[i] = rule(value)
+        except (ValueError, TypeError, AttributeError) as e:
+            errors[i] = str(e)
+    return normalized
+
+#posts held as parallel columns instead of one Posts entity (and five value objects) per row.
+#only valid rows are kept; `source_index` maps them back to the input rows
+@dataclass(slots=True)
+class PostBatch:
+    user_ids: List[str]
+    post_ids: List[str]
+    titles: List[str]
+    contents: List[str]
+    statuses: List[str]
+    created_at: List[datetime]
+    source_index: List[int]
+    errors: RowErrors
+
+    @classmethod
+    def create(cls, user_ids: Sequence[str], titles: Sequence[str], contents: Sequence[str]) -> "PostBatch":
+        errors: RowErrors = [None] * len(user_ids)
+        valid_titles = validate_column(titles, check_title, errors)
+        valid_contents = validate_column(contents, check_content, errors)
+
+        batch = cls([], [], [], [], [], [], [], errors)
+        for i, error in enumerate(errors):
+            if error is not None:
+                continue
+            batch.user_ids.append(str(user_ids[i]))
+            batch.post_ids.append(str(uuid4()))
+            batch.titles.append(valid_titles[i])
+            batch.contents.append(valid_contents[i])
+            batch.statuses.append("draft")
+            batch.created_at.append(datetime.now(timezone.utc))
+            batch.source_index.append(i)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.post_ids)
+
+    @property
+    def rejected(self) -> List[Tuple[int, str]]:
+        return [(i, error) for i, error in enumerate(self.errors) if error is not None]
+
+    def rows(self) -> Iterator[dict]:
+        for row in zip(self.user_ids, self.post_ids, self.titles, self.contents, self.statuses, self.created_at):
+            yield dict(zip(("user_id", "post_id", "title", "content", "status", "created_at"), row))
+
+    def events(self) -> Iterator[DomainEvent]:
+        """PostRegisteredEvent per row, built lazily for the outbox insert"""
+        for user_id, post_id in zip(self.user_ids, self.post_ids):
+            yield PostRegisteredEvent(user_id=UserID(user_id), post_id=UserID(post_id))
+
+#registered users as parallel columns; `passwords` holds argon hashes, never plaintext
+@dataclass(slots=True)
+class UserBatch:
+    usernames: List[str] = field(default_factory=list)
+    user_ids: List[str] = field(default_factory=list)
+    passwords: List[str] = field(default_factory=list)
+    created_at: List[datetime] = field(default_factory=list)
+    source_index: List[int] = field(default_factory=list)
+    errors: RowErrors = field(default_factory=list)
+
+    @staticmethod
+    def validate(raw_usernames: Sequence[str], plain_passwords: Sequence[str]) -> Tuple[List[Optional[str]], RowErrors]:
+        """Normalized usernames and per-row errors, including duplicates within the batch"""
+        errors: RowErrors = [None] * len(raw_usernames)
+        usernames = validate_column(raw_usernames, check_username, errors)
+        validate_column(plain_passwords, check_password, errors)
+
+        seen = set()
+        for i, username in enumerate(usernames):
+            if errors[i] is not None:
+                continue
+            if username in seen:
+                errors[i] = "Duplicate username in batch"
+            seen.add(username)
+        return usernames, errors
+
+    @classmethod
+    async def register(
+            cls,
+            usernames: Sequence[Optional[str]],
+            plain_passwords: Sequence[str],
+            errors: RowErrors,
+            hasher: ArgonConfigProtocol,
+            hash_concurrency: int = 8,
+    ) -> "UserBatch":
+        """Hash every row still free of errors; hashing failures are recorded in `errors`"""
+        semaphore = asyncio.Semaphore(hash_concurrency)
+
+        async def hash_row(i: int) -> str:
+            async with semaphore:
+                return await hasher.hash(plain_passwords[i])
+
+        indexes = [i for i, error in enumerate(errors) if error is None]
+        hashed = await asyncio.gather(*(hash_row(i) for i in indexes), return_exceptions=True)
+
+        batch = cls(errors=errors)
+        for i, value in zip(indexes, hashed):
+            if isinstance(value, Exception):
+                errors[i] = str(value)
+                continue
+            batch.usernames.append(usernames[i])
+            batch.user_ids.append(str(uuid4()))
+            batch.passwords.append(value)
+            batch.created_at.append(datetime.now(timezone.utc))
+            batch.source_index.append(i)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def rows(self) -> Iterator[dict]:
+        for row in zip(self.usernames, self.user_ids, self.passwords, self.created_at):
+            yield dict(zip(("username", "user_id", "password", "created_at"), row))
+
+    def events(self) -> Iterator[DomainEvent]:
+        for username, user_id in zip(self.usernames, self.user_ids):
+            yield UserRegisteredEvent(user_id=UserID(user_id), username=Name(username))
@@ -17,10 +17,10 @@ class User:
     _events: List["DomainEvent"] = field(default_factory=list, repr=False, init=False)
 
     @classmethod
-    def register(cls, raw_username: str, plain_password: str, hasher: ArgonConfigProtocol) -> "User":
+    async def register(cls, raw_username: str, plain_password: str, hasher: ArgonConfigProtocol) -> "User":
         username = Name.create(raw_username)
         user_id = UserID.generate()
-        password = Hash.for_plain(plain_password, hasher)
+        password = await Hash.for_plain(plain_password, hasher)
 
         user = object.__new__(cls)
         object.__setattr__(user, "username", username)
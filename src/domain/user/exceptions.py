@@ -0,0 +1,17 @@
+class UserAlreadyExistsError(Exception):
+    def __init__(self, username: str) -> None:
+        super().__init__(f"The username '{username}' is already taken")
+        self.username = username
+
+class InvalidCredentialsError(Exception):
+    def __init__(self) -> None:
+        super().__init__("Invalid username or password")
+
+class RefreshTokenReuseError(Exception):
+    def __init__(self) -> None:
+        super().__init__("Refresh token has already been used")
+
+class UserNotFoundError(Exception):
+    def __init__(self, user_id: str) -> None:
+        super().__init__(f"User '{user_id}' does not exist")
+        self.user_id = user_id
\ No newline at end of file
@@ -3,6 +3,82 @@ from uuid import uuid4, UUID
 
 from src.domain.protocols.argon_config_protocol import ArgonConfigProtocol
 
+#validation rules shared by the value objects and the column validators in batches.py:
+#each returns the normalized value or raises ValueError
+
+def check_username(raw: str) -> str:
+    v = raw.strip()
+    if not v:
+        raise ValueError("username cannot be empty")
+    if len(v) < 8:
+        raise ValueError("username is too short")
+    if len(v) > 15:
+        raise ValueError("username is too long")
+    return v
+
+def check_password(plain_password: str) -> str:
+    if len(plain_password) < 5:
+        raise ValueError("The password must not be less than 5 characters long.")
+    if len(plain_password) > 15:
+        raise ValueError("The password must not be longer than 15 characters.")
+    return plain_password
+
+def check_profile_name(raw: str) -> str:
+    v = raw.strip()
+    if not v:
+        raise ValueError("name cannot be empty")
+    if len(v) < 3:
+        raise ValueError("name is too short")
+    if len(v) > 10:
+        raise ValueError("name is too long")
+    return v
+
+def check_age(v: int) -> int:
+    if not isinstance(v, int):
+        raise ValueError("Age must be int")
+    if v <= 0:
+        raise ValueError("age cannot be less than 0")
+    if v >= 80:
+        raise ValueError("age cannot be more than 80")
+    return v
+
+def check_city(raw: str) -> str:
+    v = raw.strip()
+    if not isinstance(v, str):
+        raise TypeError("City must be str")
+    if len(v) < 1:
+        raise ValueError("city is too short")
+    if len(v) > 10:
+        raise ValueError("city is too long")
+    return v
+
+def check_title(raw: str) -> str:
+    v = raw.strip()
+    if not isinstance(v, str):
+        raise ValueError("Title must be str")
+    if len(v) < 3:
+        raise ValueError("Title is too short")
+    if len(v) > 25:
+        raise ValueError("Title is too long")
+    return v
+
+def check_content(raw: str) -> str:
+    v = raw.strip()
+    if not isinstance(v, str):
+        raise ValueError("Content must be str")
+    if len(v) < 3:
+        raise ValueError("Content is to short")
+    if len(v) > 255:
+        raise ValueError("Content is to long")
+    return v
+
+STATUSES = frozenset({"draft", "published", "archived"})
+
+def check_status(value: str) -> str:
+    if value not in STATUSES:
+        raise ValueError(f"Invalid status: {value}")
+    return value
+
 @dataclass(frozen=True, slots=True)
 class UserID:
     value: UUID = field(default_factory=uuid4)
@@ -16,14 +92,7 @@ class Name:
     value: str
 
     def __post_init__(self) -> None:
-        v = self.value.strip()
-        if not v:
-            raise ValueError("username cannot be empty")
-        if len(v) < 8:
-            raise ValueError("username is too short")
-        if len(v) > 15:
-            raise ValueError("username is too long")
-        object.__setattr__(self, "value", v)
+        object.__setattr__(self, "value", check_username(self.value))
     
     @classmethod
     def create(cls, raw: str) -> "Name":
@@ -33,30 +102,27 @@ class Name:
 class Hash:
     value: str
 
+    @staticmethod
+    def validate_plain(plain_password: str) -> None:
+        check_password(plain_password)
+
     @classmethod
-    def for_plain(cls, plain_password: str, hasher: ArgonConfigProtocol) -> "Hash":
-        if len(plain_password) < 5:
-            raise ValueError("The password must not be less than 5 characters long.")
-        if len(plain_password) > 15:
-            raise ValueError("The password must not be longer than 15 characters.")
-        return cls(hasher.hash(plain_password))
+    async def for_plain(cls, plain_password: str, hasher: ArgonConfigProtocol) -> "Hash":
+        cls.validate_plain(plain_password)
+        return cls(await hasher.hash(plain_password))
+    
+    async def verify(cls, plain_password: str, hasher: ArgonConfigProtocol) -> bool:
+        return await hasher.verify(cls.value, plain_password)
     
-    def verify(cls, plain_password: str, hasher: ArgonConfigProtocol) -> bool:
-        return hasher.verify(cls.value, plain_password)
+    def needs_rehash(cls, hasher: ArgonConfigProtocol) -> bool:
+        return hasher.needs_rehash(cls.value)
 
 @dataclass(frozen=True, slots=True)
 class NameProfile:
     value: str
 
     def __post_init__(self) -> None:
-        v = self.value.strip()
-        if not v:
-            raise ValueError("name cannot be empty")
-        if len(v) < 3:
-            raise ValueError("name is too short")
-        if len(v) > 10:
-            raise ValueError("name is too long")
-        object.__setattr__(self, "value", v)
+        object.__setattr__(self, "value", check_profile_name(self.value))
     
     @classmethod
     def create(cls, name: str) -> "NameProfile":
@@ -67,14 +133,7 @@ class Age:
     value: int
 
     def __post_init__(self) -> None:
-        v = self.value
-        if not isinstance(self.value, int):
-            raise ValueError("Age must be int")
-        if v <= 0:
-            raise ValueError("age cannot be less than 0")
-        if v >= 80:
-            raise ValueError("age cannot be more than 80")
-        object.__setattr__(self, "value", v)
+        object.__setattr__(self, "value", check_age(self.value))
     
     @classmethod
     def create(cls, age: int) -> "Age":
@@ -85,14 +144,7 @@ class City:
     value: str
 
     def __post_init__(self) -> None:
-        v = self.value.strip()
-        if not isinstance(v, str):
-            raise TypeError("City must be str")
-        if len(v) < 1:
-            raise ValueError("city is too short")
-        if len(v) > 10:
-            raise ValueError("city is too long")
-        object.__setattr__(self, "value", v)
+        object.__setattr__(self, "value", check_city(self.value))
     
     @classmethod
     def create(cls, city: str) -> "City":
@@ -103,14 +155,7 @@ class Title:
     value: str
 
     def __post_init__(self) -> None:
-        v = self.value.strip()
-        if not isinstance(v, str):
-            raise ValueError("Title must be str")
-        if len(v) < 3:
-            raise ValueError("Title is too short")
-        if len(v) > 25:
-            raise ValueError("Title is too long")
-        object.__setattr__(self, "value", v)
+        object.__setattr__(self, "value", check_title(self.value))
     
     @classmethod
     def create(cls, title: str) -> "Title":
@@ -121,14 +166,7 @@ class Content:
     value: str
 
     def __post_init__(self) -> None:
-        v = self.value.strip()
-        if not isinstance(v, str):
-            raise ValueError("Content must be str")
-        if len(v) < 3:
-            raise ValueError("Content is to short")
-        if len(v) > 255:
-            raise ValueError("Content is to long")
-        object.__setattr__(self, "value", v)
+        object.__setattr__(self, "value", check_content(self.value))
     
     @classmethod
     def create(cls, content: str) -> "Content":
@@ -151,5 +189,4 @@ class Status:
         return cls("archived")
     
     def __post_init__(self) -> None:
-        if self.value not in {"draft", "published", "archived"}:
-            raise ValueError(f"Invalid status: {self.value}")
\ No newline at end of file
+        check_status(self.value)
\ No newline at end of file
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Protocol, Optional, Any, Hashable, Dict, Set, Tuple
+
+import time
+
+#pluggable cache backend; entries live in namespaces that are invalidated as a whole.
+#`generation` lets a reader that raced an invalidation drop its now-stale value
+class CacheBackendProtocol(Protocol):
+    async def get(self, namespace: str, key: Hashable) -> Optional[Any]: ...
+    async def set(self, namespace: str, key: Hashable, value: Any, size: int, generation: int) -> None: ...
+    async def generation(self, namespace: str) -> int: ...
+    async def invalidate(self, namespace: str) -> None: ...
+    def stats(self) -> Dict[str, Any]: ...
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float
+
+#in-process LRU bounded by total bytes, with a per-entry TTL
+class LRUCacheBackend(CacheBackendProtocol):
+    def __init__(self, max_bytes: int, ttl_seconds: float) -> None:
+        self._max_bytes = max_bytes
+        self._ttl = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, Hashable], _Entry]" = OrderedDict()
+        self._namespaces: Dict[str, Set[Hashable]] = {}
+        self._generations: Dict[str, int] = {}
+        self._bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    async def get(self, namespace: str, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            self._misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._drop(namespace, key)
+            self._expirations += 1
+            self._misses += 1
+            return None
+        self._entries.move_to_end((namespace, key))
+        self._hits += 1
+        return entry.value
+
+    async def set(self, namespace: str, key: Hashable, value: Any, size: int, generation: int) -> None:
+        if size > self._max_bytes or generation != self._generations.get(namespace, 0):
+            return
+        if (namespace, key) in self._entries:
+            self._drop(namespace, key)
+        self._entries[(namespace, key)] = _Entry(value, size, time.monotonic() + self._ttl)
+        self._namespaces.setdefault(namespace, set()).add(key)
+        self._bytes += size
+        while self._bytes > self._max_bytes:
+            (old_namespace, old_key), _ = next(iter(self._entries.items()))
+            self._drop(old_namespace, old_key)
+            self._evictions += 1
+
+    async def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    async def invalidate(self, namespace: str) -> None:
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        for key in list(self._namespaces.get(namespace, ())):
+            self._drop(namespace, key)
+        self._invalidations += 1
+
+    def _drop(self, namespace: str, key: Hashable) -> None:
+        entry = self._entries.pop((namespace, key))
+        self._bytes -= entry.size
+        keys = self._namespaces[namespace]
+        keys.discard(key)
+        if not keys:
+            del self._namespaces[namespace]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "ttl_seconds": self._ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "invalidations": self._invalidations,
+        }
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Tuple
+
+import base64
+import json
+
+#opaque keyset cursor: the (created_at, post_id) of the last row already served
+def encode_cursor(created_at: datetime, post_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), post_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, post_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(post_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+#opaque keyset cursor for ranked results: the (rank, rowid) of the last row already served
+def encode_rank_cursor(rank: float, rowid: int) -> str:
+    raw = json.dumps([rank, rowid], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, rowid = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(rank), int(rowid)
+    except Exception:
+        raise ValueError("Invalid cursor")
@@ -0,0 +1,115 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy.sql import Executable
+
+from dataclasses import dataclass, field
+from typing import Optional, Tuple, List, Dict, Any
+
+import asyncio
+import time
+
+from src.infrastructure.log.logger import logger
+from src.infrastructure.metrics.histogram import Histogram
+
+@dataclass
+class _PendingWrite:
+    statements: Tuple[Executable, ...]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+#merges writes that arrive within `window_ms` (up to `max_batch`) into one transaction;
+#if the shared transaction fails every write is retried alone so callers fail independently
+class GroupCommitter:
+    def __init__(
+            self,
+            async_factory: async_sessionmaker[AsyncSession],
+            window_ms: float = 2.0,
+            max_batch: int = 64,
+    ) -> None:
+        self._async_factory = async_factory
+        self._window = window_ms / 1000
+        self._max_batch = max_batch
+        self._queue: Optional[asyncio.Queue[Optional[_PendingWrite]]] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.batch_size = Histogram(buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+        self.wait_seconds = Histogram(buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"group commit started (window={self._window * 1000}ms, max_batch={self._max_batch})")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        #the sentinel lets every write queued before it land first
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+        logger.info("group commit stopped")
+
+    async def submit(self, *statements: Executable) -> None:
+        if self._task is None:
+            self.start()
+        write = _PendingWrite(statements, asyncio.get_running_loop().create_future())
+        self._queue.put_nowait(write)
+        await write.future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = loop.time() + self._window
+            while len(batch) < self._max_batch:
+                if not self._queue.empty():
+                    write = self._queue.get_nowait()
+                else:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        write = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if write is None:
+                    stopping = True
+                    break
+                batch.append(write)
+            self.batch_size.observe(len(batch))
+            await self._commit(batch)
+
+    async def _commit(self, batch: List[_PendingWrite]) -> None:
+        try:
+            async with self._async_factory() as session:
+                async with session.begin():
+                    for write in batch:
+                        for stmt in write.statements:
+                            await session.execute(stmt)
+        except Exception as e:
+            if len(batch) == 1:
+                if not batch[0].future.done():
+                    batch[0].future.set_exception(e)
+                return
+            for write in batch:
+                await self._commit([write])
+            return
+
+        now = time.perf_counter()
+        for write in batch:
+            self.wait_seconds.observe(now - write.enqueued_at)
+            if not write.future.done():
+                write.future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": self._window * 1000,
+            "max_batch": self._max_batch,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batch_size": self.batch_size.snapshot(),
+            "wait_seconds": self.wait_seconds.snapshot(),
+        }
@@ -1,13 +1,17 @@
 from sqlalchemy.orm import DeclarativeBase, relationship, Mapped, mapped_column
-from sqlalchemy import String, Integer, ForeignKey, Text
+from sqlalchemy import String, Integer, Float, ForeignKey, Text, Index, text
 
-from typing import List
+from typing import List, Optional
 
 from datetime import datetime
 
+import hashlib
+
 class Base(DeclarativeBase):
     pass
 
+#relationships are lazy="raise": every read path selects what it needs explicitly,
+#so an accidental per-row lazy load fails loudly instead of issuing N queries
 class UserModel(Base):
     __tablename__ = "user"
 
@@ -26,10 +30,10 @@ class UserModel(Base):
     )
 
     profile: Mapped["UserProfile"] = relationship(
-        back_populates="user", uselist=False,
+        back_populates="user", uselist=False, lazy="raise",
     )
     posts: Mapped[List["UserPosts"]] = relationship(
-        back_populates="user", cascade="all, delete-orphan"
+        back_populates="user", cascade="all, delete-orphan", lazy="raise",
     )
 
 class UserProfile(Base):
@@ -49,18 +53,27 @@ class UserProfile(Base):
     )
 
     user: Mapped["UserModel"] = relationship(
-        back_populates="profile", uselist=False,
+        back_populates="profile", uselist=False, lazy="raise",
     )
 
 class UserPosts(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        #keyset pagination walks this index newest-first per user
+        Index("ix_posts_user_id_created_at_post_id", "user_id", "created_at", "post_id"),
+    )
 
+    #INTEGER PRIMARY KEY aliases the rowid, so unlike an implicit rowid VACUUM never
+    #renumbers it; the full-text index is keyed on it
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True,
+    )
     user_id: Mapped[str] = mapped_column(
         ForeignKey("user.user_id", ondelete="CASCADE"),
         index=True, nullable=False,
     )
     post_id: Mapped[str] = mapped_column(
-        String, primary_key=True, index=True,
+        String, unique=True, index=True,
         nullable=False,
     )
     title: Mapped[str] = mapped_column(
@@ -77,7 +90,124 @@ class UserPosts(Base):
         nullable=False,
     )
     user: Mapped["UserModel"] = relationship(
-        back_populates="posts",
+        back_populates="posts", lazy="raise",
+    )
+
+#denormalised per-status post counts, bumped in the same transaction as the post INSERT
+class PostCounter(Base):
+    __tablename__ = "post_counters"
+
+    user_id: Mapped[str] = mapped_column(
+        ForeignKey("user.user_id", ondelete="CASCADE"), primary_key=True,
+    )
+    status: Mapped[str] = mapped_column(
+        String(20), primary_key=True,
+    )
+    count: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False,
+    )
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox"
+    __table_args__ = (
+        #the dispatcher only ever scans undelivered rows
+        Index("ix_outbox_pending", "id", sqlite_where=text("dispatched_at IS NULL")),
+    )
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True,
+    )
+    event_id: Mapped[str] = mapped_column(
+        String, unique=True, nullable=False,
+    )
+    event_type: Mapped[str] = mapped_column(
+        String, nullable=False,
+    )
+    payload: Mapped[str] = mapped_column(
+        Text, nullable=False,
+    )
+    occurred_at: Mapped[datetime] = mapped_column(
+        nullable=False,
+    )
+    dispatched_at: Mapped[Optional[datetime]] = mapped_column(
+        nullable=True,
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False,
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True,
+    )
+    #lease taken by the dispatcher delivering the row, so only one worker holds it at a time
+    claimed_by: Mapped[Optional[str]] = mapped_column(
+        String, nullable=True,
+    )
+    claimed_until: Mapped[Optional[datetime]] = mapped_column(
+        nullable=True,
+    )
+    #set once attempts run out: the row is parked for inspection and no longer pending
+    dead_lettered_at: Mapped[Optional[datetime]] = mapped_column(
+        nullable=True,
+    )
+
+#revoked JWT ids, kept until the token would have expired anyway
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True,
+    )
+    jti: Mapped[str] = mapped_column(
+        String, unique=True, nullable=False,
     )
+    expires_at: Mapped[float] = mapped_column(
+        Float, nullable=False, index=True,
+    )
+    revoked_at: Mapped[datetime] = mapped_column(
+        nullable=False,
+    )
+
+#single row recording which metadata fingerprint the database was last created from
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True,
+    )
+    fingerprint: Mapped[str] = mapped_column(
+        String, nullable=False,
+    )
+    applied_at: Mapped[datetime] = mapped_column(
+        nullable=False,
+    )
+
+#FTS5 index over posts.title/content. It is external-content (the text stays in
+#posts, keyed by posts.id) and kept in sync by triggers, so every insert path is
+#covered. create_all cannot emit virtual tables; DataBaseConfig.connect runs these
+POSTS_FTS_TABLE = "posts_fts"
+POSTS_FTS_TRIGGERS = ("posts_fts_ai", "posts_fts_ad", "posts_fts_au")
+POSTS_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {POSTS_FTS_TABLE} USING fts5("
+    "title, content, content='posts', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN "
+    f"INSERT INTO {POSTS_FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN "
+    f"INSERT INTO {POSTS_FTS_TABLE}({POSTS_FTS_TABLE}, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN "
+    f"INSERT INTO {POSTS_FTS_TABLE}({POSTS_FTS_TABLE}, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    f"INSERT INTO {POSTS_FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content); END",
+)
 
-    
\ No newline at end of file
+def schema_fingerprint() -> str:
+    """Stable digest of every table, column and index declared on Base.metadata, plus the FTS DDL"""
+    parts = [f"ddl:{statement}" for statement in POSTS_FTS_DDL]
+    for table in Base.metadata.sorted_tables:
+        parts.append(f"table:{table.name}")
+        for column in table.columns:
+            parts.append(f"column:{column.name}:{column.type}:{column.nullable}:{column.primary_key}")
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            parts.append(f"index:{index.name}:{','.join(c.name for c in index.columns)}:{index.unique}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
@@ -0,0 +1,66 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import insert, select, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import Executable
+
+from datetime import datetime, timezone
+from typing import Optional, List, Tuple
+
+from src.infrastructure.log.logger import logger
+from src.infrastructure.db.models import RevokedToken
+from src.infrastructure.db.group_commit import GroupCommitter
+
+class DenylistRepository:
+    def __init__(
+            self,
+            async_factory: async_sessionmaker[AsyncSession],
+            group_commit: Optional[GroupCommitter] = None,
+            read_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+    ) -> None:
+        self._async_factory = async_factory
+        self._read_factory = read_factory or async_factory
+        self._group_commit = group_commit
+    
+    async def _write(self, *statements: Executable) -> None:
+        if self._group_commit is not None:
+            await self._group_commit.submit(*statements)
+            return
+        async with self._async_factory() as session:
+            for stmt in statements:
+                await session.execute(stmt)
+            await session.commit()
+    
+    async def add(self, jti: str, expires_at: float) -> bool:
+        """True if this call recorded the revocation, False if the jti was already revoked"""
+        try:
+            await self._write(insert(RevokedToken).values(
+                jti=jti, expires_at=expires_at, revoked_at=datetime.now(timezone.utc),
+            ))
+            return True
+        except IntegrityError:
+            #already revoked, e.g. by a concurrent logout or refresh on another worker
+            return False
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
+    
+    async def fetch_since(self, last_id: int, now: float) -> List[Tuple[int, str, float]]:
+        """(id, jti, expires_at) of still-live revocations recorded after `last_id`"""
+        try:
+            async with self._read_factory() as session:
+                rows = await session.execute(
+                    select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at)
+                    .where(RevokedToken.id > last_id, RevokedToken.expires_at > now)
+                    .order_by(RevokedToken.id)
+                )
+                return [tuple(row) for row in rows]
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
+    
+    async def purge_expired(self, now: float) -> None:
+        try:
+            await self._write(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
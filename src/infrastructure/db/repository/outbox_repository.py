@@ -0,0 +1,134 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import insert, select, update, func, case
+from sqlalchemy.sql import Executable
+
+from datetime import datetime, timezone, timedelta
+from typing import Optional, List, Iterable, Dict, Any
+
+import json
+
+from src.infrastructure.log.logger import logger
+from src.infrastructure.db.models import OutboxEvent
+from src.infrastructure.db.group_commit import GroupCommitter
+from src.domain.events.domain_event import DomainEvent
+
+def outbox_statements(events: Iterable[DomainEvent], chunk_size: int = 500) -> List[Executable]:
+    """INSERTs that put the events in the outbox, to run in the aggregate's own transaction"""
+    rows = []
+    for event in events:
+        data = event.to_dict()
+        rows.append({
+            "event_id": data["event_id"],
+            "event_type": data["event_type"],
+            "payload": json.dumps(data),
+            "occurred_at": event.occurred_at,
+        })
+    return [
+        insert(OutboxEvent).values(rows[start:start + chunk_size])
+        for start in range(0, len(rows), chunk_size)
+    ]
+
+class OutboxRepository:
+    def __init__(
+            self,
+            async_factory: async_sessionmaker[AsyncSession],
+            group_commit: Optional[GroupCommitter] = None,
+            read_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+    ) -> None:
+        self._async_factory = async_factory
+        self._read_factory = read_factory or async_factory
+        self._group_commit = group_commit
+    
+    async def _write(self, *statements: Executable) -> None:
+        if self._group_commit is not None:
+            await self._group_commit.submit(*statements)
+            return
+        async with self._async_factory() as session:
+            for stmt in statements:
+                await session.execute(stmt)
+            await session.commit()
+    
+    async def claim_pending(self, worker_id: str, limit: int, max_attempts: int, lease_seconds: float) -> List[OutboxEvent]:
+        """Lease up to `limit` undelivered rows to `worker_id` in one UPDATE ... RETURNING.
+        Rows under another worker's unexpired lease are skipped, so each event has one dispatcher at a time;
+        a lease left by a crashed worker runs out and the row is picked up again"""
+        now = datetime.now(timezone.utc)
+        claimable = (
+            select(OutboxEvent.id)
+            .where(
+                OutboxEvent.dispatched_at.is_(None),
+                OutboxEvent.dead_lettered_at.is_(None),
+                OutboxEvent.attempts < max_attempts,
+                (OutboxEvent.claimed_until.is_(None)) | (OutboxEvent.claimed_until < now),
+            )
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+        )
+        try:
+            #needs the RETURNING rows back, so it bypasses the group-commit queue
+            async with self._async_factory() as session:
+                events = await session.scalars(
+                    update(OutboxEvent)
+                    .where(OutboxEvent.id.in_(claimable))
+                    .values(claimed_by=worker_id, claimed_until=now + timedelta(seconds=lease_seconds))
+                    .returning(OutboxEvent),
+                    execution_options={"synchronize_session": False},
+                )
+                claimed = sorted(events.all(), key=lambda event: event.id)
+                await session.commit()
+                return claimed
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
+    
+    async def mark_dispatched(self, ids: List[int]) -> None:
+        if not ids:
+            return
+        try:
+            await self._write(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_(ids))
+                .values(
+                    dispatched_at=datetime.now(timezone.utc), attempts=OutboxEvent.attempts + 1,
+                    claimed_by=None, claimed_until=None,
+                )
+            )
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
+    
+    async def mark_failed(self, errors: Dict[int, str], max_attempts: int) -> None:
+        """Count a failed attempt; the attempt that reaches `max_attempts` dead-letters the row"""
+        if not errors:
+            return
+        now = datetime.now(timezone.utc)
+        try:
+            await self._write(*(
+                update(OutboxEvent)
+                .where(OutboxEvent.id == event_id)
+                .values(
+                    attempts=OutboxEvent.attempts + 1, last_error=error,
+                    claimed_by=None, claimed_until=None,
+                    dead_lettered_at=case((OutboxEvent.attempts + 1 >= max_attempts, now), else_=None),
+                )
+                for event_id, error in errors.items()
+            ))
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
+    
+    async def pending_stats(self) -> Dict[str, Any]:
+        try:
+            async with self._read_factory() as session:
+                result = await session.execute(
+                    select(func.count(OutboxEvent.id), func.min(OutboxEvent.occurred_at))
+                    .where(OutboxEvent.dispatched_at.is_(None), OutboxEvent.dead_lettered_at.is_(None))
+                )
+                pending, oldest = result.one()
+                dead_lettered = await session.scalar(
+                    select(func.count(OutboxEvent.id)).where(OutboxEvent.dead_lettered_at.is_not(None))
+                )
+                return {"pending": pending, "oldest_occurred_at": oldest, "dead_lettered": dead_lettered}
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
@@ -0,0 +1,156 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import text, String, DateTime, Float, Integer
+
+from typing import Optional, Tuple, List, Dict, Any
+
+import html
+
+from src.infrastructure.log.logger import logger
+from src.infrastructure.db.models import POSTS_FTS_TABLE
+from src.infrastructure.db.cursor import encode_rank_cursor, decode_rank_cursor
+from src.infrastructure.metrics.registry import timed
+
+#bm25 column weights: a hit in the title counts ten times one in the body
+TITLE_WEIGHT, CONTENT_WEIGHT = 10.0, 1.0
+MAX_QUERY_TERMS = 16
+SNIPPET_TOKENS = 16
+
+#control characters as match markers so the user's text can be html-escaped before <mark> goes in
+_OPEN, _CLOSE = "\x02", "\x03"
+
+def to_match_query(query: str) -> str:
+    """User input as an FTS5 query: every term quoted (no operator injection), all terms required, `term*` is a prefix"""
+    terms = []
+    for raw in query.split()[:MAX_QUERY_TERMS]:
+        prefix = raw.endswith("*") and len(raw) > 1
+        term = raw.rstrip("*") if prefix else raw
+        terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    if not terms:
+        raise ValueError("Search query must not be empty")
+    return " ".join(terms)
+
+def _marked(value: str) -> str:
+    return html.escape(value).replace(_OPEN, "<mark>").replace(_CLOSE, "</mark>")
+
+class PostSearchRepository:
+    def __init__(
+            self,
+            async_factory: async_sessionmaker[AsyncSession],
+            read_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+    ) -> None:
+        self._async_factory = async_factory
+        self._read_factory = read_factory or async_factory
+
+    @timed("repo.search_posts")
+    async def search_posts(
+            self,
+            query: str,
+            limit: int = 20,
+            cursor: Optional[str] = None,
+            user_id: Optional[str] = None,
+            status: Optional[str] = None,
+            viewer_id: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """BM25-ranked posts matching `query`, best first, with keyset pagination on (rank, posts.id).
+        With `viewer_id`, other users' posts are only visible once published."""
+        params: Dict[str, Any] = {"query": to_match_query(query), "limit": limit + 1}
+        filters = [f"{POSTS_FTS_TABLE} MATCH :query"]
+        if user_id is not None:
+            filters.append("p.user_id = :user_id")
+            params["user_id"] = user_id
+        if status is not None:
+            filters.append("p.status = :status")
+            params["status"] = status
+        if viewer_id is not None:
+            filters.append("(p.user_id = :viewer_id OR p.status = 'published')")
+            params["viewer_id"] = viewer_id
+        if cursor is not None:
+            params["after_rank"], params["after_rowid"] = decode_rank_cursor(cursor)
+            filters.append("(bm25_rank > :after_rank OR (bm25_rank = :after_rank AND f.rowid > :after_rowid))")
+
+        #the CTE ranks and pages on rowids alone; highlight/snippet then run only for the page,
+        #each as a rowid-equality lookup (CROSS JOIN pins the hits as the outer loop)
+        stmt = text(f"""
+            WITH hits AS (
+                SELECT f.rowid AS rid, bm25({POSTS_FTS_TABLE}, {TITLE_WEIGHT}, {CONTENT_WEIGHT}) AS bm25_rank
+                FROM {POSTS_FTS_TABLE} AS f JOIN posts AS p ON p.id = f.rowid
+                WHERE {" AND ".join(filters)}
+                ORDER BY bm25_rank, rid
+                LIMIT :limit
+            )
+            SELECT p.post_id, p.user_id, p.title, p.status, p.created_at, hits.bm25_rank, hits.rid,
+                   highlight({POSTS_FTS_TABLE}, 0, '{_OPEN}', '{_CLOSE}') AS title_highlight,
+                   snippet({POSTS_FTS_TABLE}, 1, '{_OPEN}', '{_CLOSE}', '…', {SNIPPET_TOKENS}) AS snippet
+            FROM hits
+            CROSS JOIN {POSTS_FTS_TABLE}
+            CROSS JOIN posts AS p
+            WHERE {POSTS_FTS_TABLE} MATCH :query
+              AND {POSTS_FTS_TABLE}.rowid = hits.rid
+              AND p.id = hits.rid
+            ORDER BY hits.bm25_rank, hits.rid
+        """).columns(
+            post_id=String, user_id=String, title=String, status=String, created_at=DateTime,
+            bm25_rank=Float, rid=Integer, title_highlight=String, snippet=String,
+        )
+
+        try:
+            async with self._read_factory() as session:
+                rows = (await session.execute(stmt, params)).all()
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
+
+        page = rows[:limit]
+        items = [
+            {
+                "post_id": row.post_id,
+                "user_id": row.user_id,
+                "title": row.title,
+                "status": row.status,
+                "created_at": row.created_at,
+                #bm25 is lower-is-better; flipped so clients see higher-is-better
+                "score": -row.bm25_rank,
+                "title_highlight": _marked(row.title_highlight),
+                "snippet": _marked(row.snippet),
+            }
+            for row in page
+        ]
+        next_cursor = encode_rank_cursor(page[-1].bm25_rank, page[-1].rid) if len(rows) > limit else None
+        return items, next_cursor
+
+    async def rebuild(self, batch_size: int = 5000) -> int:
+        """Re-index every post from scratch, one transaction per batch of post ids.
+        Posts inserted meanwhile get ids past the snapshot and are indexed by the trigger;
+        until the last batch commits, searches see a partial index"""
+        try:
+            async with self._async_factory() as session:
+                high = (await session.execute(text("SELECT max(id) FROM posts"))).scalar()
+                await session.execute(text(f"INSERT INTO {POSTS_FTS_TABLE}({POSTS_FTS_TABLE}) VALUES ('delete-all')"))
+                await session.commit()
+            if high is None:
+                return 0
+
+            indexed, last = 0, 0
+            while last < high:
+                async with self._async_factory() as session:
+                    upper = (await session.execute(text(
+                        "SELECT id FROM posts WHERE id > :last AND id <= :high "
+                        "ORDER BY id LIMIT 1 OFFSET :offset"
+                    ), {"last": last, "high": high, "offset": batch_size - 1})).scalar()
+                    upper = high if upper is None else upper
+                    result = await session.execute(text(
+                        f"INSERT INTO {POSTS_FTS_TABLE}(rowid, title, content) "
+                        "SELECT id, title, content FROM posts WHERE id > :last AND id <= :upper"
+                    ), {"last": last, "upper": upper})
+                    await session.commit()
+                indexed += result.rowcount
+                last = upper
+                logger.info(f"search index rebuild: {indexed} posts indexed (id {last}/{high})")
+
+            async with self._async_factory() as session:
+                await session.execute(text(f"INSERT INTO {POSTS_FTS_TABLE}({POSTS_FTS_TABLE}) VALUES ('optimize')"))
+                await session.commit()
+            return indexed
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
@@ -1,81 +1,325 @@
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
-from sqlalchemy import insert, select
+from sqlalchemy import insert, select, update, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import Executable
 
-from typing import Optional
+from typing import Optional, Tuple, List, AsyncIterator, Dict, Any, Set, Iterable
+from collections import Counter
 
 from src.infrastructure.log.logger import logger
-from src.infrastructure.db.models import UserModel, UserProfile, UserPosts
+from src.infrastructure.db.models import UserModel, UserProfile, UserPosts, PostCounter
+from src.infrastructure.db.username_filter import UsernameBloomFilter
+from src.infrastructure.db.cursor import encode_cursor, decode_cursor
+from src.infrastructure.db.group_commit import GroupCommitter
+from src.infrastructure.cache.backend import CacheBackendProtocol
+from src.infrastructure.metrics.registry import timed
+from src.infrastructure.db.repository.outbox_repository import outbox_statements
 from src.domain.user.entities import User, Profile, Posts
+from src.domain.user.batches import UserBatch, PostBatch
+from src.domain.user.exceptions import UserAlreadyExistsError
 from src.domain.protocols.user_repository_protocol import UserRepositoryProtocol
 
+#the columns every post read returns, matching the PostItem response schema
+POST_COLUMNS = (
+    UserPosts.post_id, UserPosts.user_id, UserPosts.title,
+    UserPosts.content, UserPosts.status, UserPosts.created_at,
+)
+
+def post_counter_statements(keys: Iterable[Tuple[str, str]]) -> List[Executable]:
+    """Upserts adding one per (user_id, status) key, to run in the posts' own transaction"""
+    counts = Counter(keys)
+    if not counts:
+        return []
+    stmt = sqlite_insert(PostCounter).values([
+        {"user_id": user_id, "status": status, "count": count}
+        for (user_id, status), count in counts.items()
+    ])
+    return [stmt.on_conflict_do_update(
+        index_elements=[PostCounter.user_id, PostCounter.status],
+        set_={"count": PostCounter.count + stmt.excluded.count},
+    )]
+
 class UserRepository(UserRepositoryProtocol):
     def __init__(
             self,
             async_factory: async_sessionmaker[AsyncSession],
+            username_filter: UsernameBloomFilter,
+            group_commit: Optional[GroupCommitter] = None,
+            read_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+            posts_cache: Optional[CacheBackendProtocol] = None,
     ) -> None:
         self._async_factory = async_factory
+        self._read_factory = read_factory or async_factory
+        self._username_filter = username_filter
+        self._group_commit = group_commit
+        self._posts_cache = posts_cache
+    
+    async def _write(self, *statements: Executable) -> None:
+        """Run the statements as one unit of work, through the writer queue when there is one"""
+        if self._group_commit is not None:
+            await self._group_commit.submit(*statements)
+            return
+        async with self._async_factory() as session:
+            for stmt in statements:
+                await session.execute(stmt)
+            await session.commit()
+    
+    @timed("repo.username_exists")
+    async def username_exists(self, username: str) -> bool:
+        if not self._username_filter.might_contain(username):
+            return False
+        try:
+            async with self._read_factory() as session:
+                found = await session.execute(
+                    select(UserModel.user_id).where(UserModel.username == username).limit(1)
+                )
+                return found.first() is not None
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
+    
+    @timed("repo.existing_usernames")
+    async def existing_usernames(self, usernames: Iterable[str], chunk_size: int = 500) -> Set[str]:
+        candidates = [name for name in usernames if self._username_filter.might_contain(name)]
+        found: Set[str] = set()
+        if not candidates:
+            return found
+        try:
+            async with self._read_factory() as session:
+                for start in range(0, len(candidates), chunk_size):
+                    chunk = candidates[start:start + chunk_size]
+                    rows = await session.execute(
+                        select(UserModel.username).where(UserModel.username.in_(chunk))
+                    )
+                    found.update(rows.scalars().all())
+                return found
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
     
+    @timed("repo.get_user_by_username")
+    async def get_user_by_username(self, username: str) -> Optional[UserModel]:
+        try:
+            async with self._read_factory() as session:
+                user = await session.execute(
+                    select(UserModel).where(UserModel.username == username)
+                )
+                return user.scalar_one_or_none()
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
+    
+    @timed("repo.update_password")
+    async def update_password(self, user_id: str, password: str) -> None:
+        try:
+            stmt = update(UserModel).where(UserModel.user_id == user_id).values(password=password)
+            await self._write(stmt)
+            logger.info(f"User '{user_id}' password hash was upgraded")
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
+    
+    @timed("repo.add_user")
     async def add_user(self, user: User) -> None:
         try:
-            async with self._async_factory() as session:
-                stmt = insert(UserModel).values({
-                    "username": user.username.value,
-                    "user_id": str(user.user_id.value),
-                    "password": user.password.value,
-                    "created_at": user.created_at,
-                })
-                await session.execute(stmt)
-                await session.commit()
-                logger.info("the data is successfully populated into the database")
+            stmt = insert(UserModel).values({
+                "username": user.username.value,
+                "user_id": str(user.user_id.value),
+                "password": user.password.value,
+                "created_at": user.created_at,
+            })
+            await self._write(stmt, *outbox_statements(user.pull_events()))
+            self._username_filter.add(user.username.value)
+            logger.info("the data is successfully populated into the database", extra={"sampled": True})
+        except IntegrityError:
+            #lost a race against a concurrent signup or another worker
+            self._username_filter.add(user.username.value)
+            raise UserAlreadyExistsError(user.username.value)
         except Exception as e:
             logger.exception(f"SQLAlchemy database error: {e}")
             raise
     
+    @timed("repo.add_user_batch")
+    async def add_user_batch(self, batch: UserBatch, chunk_size: int = 500) -> None:
+        #rows come straight from the columns, no User entity is materialized
+        try:
+            rows = list(batch.rows())
+            await self._write(*(
+                insert(UserModel).values(rows[start:start + chunk_size])
+                for start in range(0, len(rows), chunk_size)
+            ), *outbox_statements(batch.events(), chunk_size=chunk_size))
+            for username in batch.usernames:
+                self._username_filter.add(username)
+            logger.info(f"{len(batch)} users were successfully added in bulk")
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
+    
+    @timed("repo.add_profile")
     async def add_profile(self, profile: Profile) -> None:
         try:
-            async with self._async_factory() as session:
-                stmt = insert(UserProfile).values({
-                    "user_id": str(profile.user_id.value),
-                    "age": profile.age.value,
-                    "name": profile.name.value,
-                    "city": profile.city.value,
-                })
-                await session.execute(stmt)
-                await session.commit()
-                logger.info(f"User profile '{str(profile.user_id.value)}' was successfully added!")
+            stmt = insert(UserProfile).values({
+                "user_id": str(profile.user_id.value),
+                "age": profile.age.value,
+                "name": profile.name.value,
+                "city": profile.city.value,
+            })
+            await self._write(stmt, *outbox_statements(profile.pull_events()))
+            logger.info(f"User profile '{str(profile.user_id.value)}' was successfully added!", extra={"sampled": True})
         except Exception as e:
             logger.exception(f"SQLAlchemy database error: {e}")
             raise
     
+    @timed("repo.add_post")
     async def add_post(self, post: Posts) -> None:
         try:
-            async with self._async_factory() as session:
-                stmt = insert(UserPosts).values({
-                    "user_id": str(post.user_id.value),
-                    "post_id": str(post.post_id.value),
-                    "title": post.title.value,
-                    "content": post.content.value,
-                    "status": post.status.value,
-                    "created_at": post.created_at,
-                })
-                await session.execute(stmt)
-                await session.commit()
-                logger.info(f"User post '{str(post.user_id.value)}' was successfully added!")
+            stmt = insert(UserPosts).values({
+                "user_id": str(post.user_id.value),
+                "post_id": str(post.post_id.value),
+                "title": post.title.value,
+                "content": post.content.value,
+                "status": post.status.value,
+                "created_at": post.created_at,
+            })
+            await self._write(
+                stmt,
+                *post_counter_statements([(str(post.user_id.value), post.status.value)]),
+                *outbox_statements(post.pull_events()),
+            )
+            if self._posts_cache is not None:
+                await self._posts_cache.invalidate(str(post.user_id.value))
+            logger.info(f"User post '{str(post.user_id.value)}' was successfully added!", extra={"sampled": True})
         except Exception as e:
             logger.exception(f"SQLAlchemy database error: {e}")
             raise
     
-    async def get_user_post_by_id(self, user_id: str) -> list[UserPosts]:
+    @timed("repo.add_post_batch")
+    async def add_post_batch(self, batch: PostBatch, chunk_size: int = 500) -> None:
         try:
-            async with self._async_factory() as session:
-                posts = await session.execute(
-                    select(UserPosts).where(UserPosts.user_id == user_id)
-                )
-                result = posts.scalars().all()
-                if not result:
-                    return []
+            rows = list(batch.rows())
+            await self._write(*(
+                insert(UserPosts).values(rows[start:start + chunk_size])
+                for start in range(0, len(rows), chunk_size)
+            ), *post_counter_statements(
+                zip(batch.user_ids, batch.statuses)
+            ), *outbox_statements(batch.events(), chunk_size=chunk_size))
+            if self._posts_cache is not None:
+                for user_id in set(batch.user_ids):
+                    await self._posts_cache.invalidate(user_id)
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
+    
+    @timed("repo.get_user_overview")
+    async def get_user_overview(self, user_id: str) -> Optional[Dict[str, Any]]:
+        #user, profile and counters in one LEFT JOIN: one row per counted status, at most three
+        stmt = select(
+            UserModel.user_id, UserModel.username, UserModel.created_at,
+            UserProfile.age, UserProfile.name, UserProfile.city,
+            PostCounter.status, PostCounter.count,
+        ).select_from(UserModel).outerjoin(
+            UserProfile, UserProfile.user_id == UserModel.user_id,
+        ).outerjoin(
+            PostCounter, PostCounter.user_id == UserModel.user_id,
+        ).where(UserModel.user_id == user_id)
+
+        try:
+            async with self._read_factory() as session:
+                rows = (await session.execute(stmt)).all()
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
+        if not rows:
+            return None
+
+        first = rows[0]
+        return {
+            "user_id": first.user_id,
+            "username": first.username,
+            "created_at": first.created_at,
+            "profile": (
+                {"age": first.age, "name": first.name, "city": first.city}
+                if first.age is not None else None
+            ),
+            "post_counts": {row.status: row.count for row in rows if row.status is not None},
+        }
+    
+    @timed("repo.get_user_post_by_id")
+    async def get_user_post_by_id(
+            self,
+            user_id: str,
+            limit: int = 50,
+            cursor: Optional[str] = None,
+            status: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        if self._posts_cache is None:
+            return await self._fetch_user_posts(user_id, limit, cursor, status)
+
+        key = (limit, cursor, status)
+        page = await self._posts_cache.get(user_id, key)
+        if page is not None:
+            return page
+        generation = await self._posts_cache.generation(user_id)
+        page = await self._fetch_user_posts(user_id, limit, cursor, status)
+        size = sum(len(post["title"]) + len(post["content"]) + 256 for post in page[0]) + 128
+        await self._posts_cache.set(user_id, key, page, size=size, generation=generation)
+        return page
+    
+    @timed("repo.fetch_user_posts")
+    async def _fetch_user_posts(
+            self,
+            user_id: str,
+            limit: int,
+            cursor: Optional[str],
+            status: Optional[str],
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        #column projection: plain rows, no identity map, no relationship instrumentation
+        stmt = select(*POST_COLUMNS).where(UserPosts.user_id == user_id)
+        if status is not None:
+            stmt = stmt.where(UserPosts.status == status)
+        if cursor is not None:
+            created_at, post_id = decode_cursor(cursor)
+            stmt = stmt.where(
+                tuple_(UserPosts.created_at, UserPosts.post_id) < tuple_(created_at, post_id)
+            )
+        stmt = stmt.order_by(
+            UserPosts.created_at.desc(), UserPosts.post_id.desc(),
+        ).limit(limit + 1)
+
+        try:
+            async with self._read_factory() as session:
+                posts = await session.execute(stmt)
+                result = [row._asdict() for row in posts]
+                if len(result) <= limit:
+                    return result, None
                 
-                return result
+                last = result[limit - 1]
+                return result[:limit], encode_cursor(last["created_at"], last["post_id"])
+        except Exception as e:
+            logger.exception(f"SQLAlchemy database error: {e}")
+            raise
+    
+    @timed("repo.stream_user_posts")
+    async def stream_user_posts(
+            self,
+            user_id: str,
+            chunk_size: int = 500,
+            status: Optional[str] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        #plain column rows keep the identity map empty, so memory stays flat
+        stmt = select(*POST_COLUMNS).where(UserPosts.user_id == user_id)
+        if status is not None:
+            stmt = stmt.where(UserPosts.status == status)
+        stmt = stmt.order_by(
+            UserPosts.created_at.desc(), UserPosts.post_id.desc(),
+        ).execution_options(yield_per=chunk_size)
+
+        try:
+            async with self._read_factory() as session:
+                result = await session.stream(stmt)
+                async for partition in result.partitions():
+                    yield [row._asdict() for row in partition]
         except Exception as e:
             logger.exception(f"SQLAlchemy database error: {e}")
             raise
\ No newline at end of file
@@ -1,16 +1,59 @@
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.engine import make_url
+from sqlalchemy import event, select, delete, insert, text, inspect, func
 
-from src.infrastructure.db.models import Base
+from src.infrastructure.db.models import Base, SchemaVersion, PostCounter, UserPosts, POSTS_FTS_TABLE, POSTS_FTS_TRIGGERS, POSTS_FTS_DDL, schema_fingerprint
+from src.infrastructure.db.group_commit import GroupCommitter
+from src.infrastructure.db.sqlite_tuning import SQLiteTuning
 from src.infrastructure.log.logger import logger
 
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any
+
+import asyncio
+import os
 
 class DataBaseConfig:
     def __init__(self):
-        self._url_database = "sqlite+aiosqlite:///database.db"
+        self._url_database = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///database.db")
+        self._tuning = SQLiteTuning.from_env() if self._url_database.startswith("sqlite") else None
+        #"single": one pool for everything; "split": one writer connection fed by
+        #the group-commit queue plus a pool of query_only reader connections
+        self._topology = os.getenv("DB_TOPOLOGY", "single")
+        if self._topology not in {"single", "split"}:
+            raise ValueError(f"Invalid DB_TOPOLOGY: {self._topology}")
+        if self.is_split and self.is_memory:
+            raise ValueError("DB_TOPOLOGY=split needs a file-backed DATABASE_URL: each in-memory engine is its own database")
         self._async_engine: Optional[AsyncEngine] = None
         self._async_session: Optional[async_sessionmaker[AsyncSession]] = None
+        self._read_engine: Optional[AsyncEngine] = None
+        self._read_session: Optional[async_sessionmaker[AsyncSession]] = None
+        self._group_commit: Optional[GroupCommitter] = None
+        self._group_commit_enabled = self.is_split or os.getenv("DB_GROUP_COMMIT", "0") == "1"
+    
+    @property
+    def is_sqlite(self) -> bool:
+        return self._url_database.startswith("sqlite")
+    
+    @property
+    def is_memory(self) -> bool:
+        url = make_url(self._url_database)
+        return self.is_sqlite and (url.database in (None, "", ":memory:") or url.query.get("mode") == "memory")
+    
+    @property
+    def is_split(self) -> bool:
+        return self._topology == "split"
+    
+    def _pool_options(self, pool_size: int, max_overflow: int) -> Dict[str, Any]:
+        #in-memory SQLite gets a single shared connection (StaticPool), which takes no sizing arguments
+        if self.is_memory:
+            return {}
+        return {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 30)),
+        }
     
     @property
     def async_engine(self) -> AsyncEngine:
@@ -18,7 +61,13 @@ class DataBaseConfig:
             try:
                 self._async_engine = create_async_engine(
                     self._url_database,
+                    **self._pool_options(
+                        pool_size=1 if self.is_split else int(os.getenv("DB_POOL_SIZE", 5)),
+                        max_overflow=0 if self.is_split else int(os.getenv("DB_POOL_MAX_OVERFLOW", 10)),
+                    ),
                 )
+                if self._tuning is not None:
+                    event.listen(self._async_engine.sync_engine, "connect", self._tuning.apply)
             except SQLAlchemyError as e:
                 logger.exception(f"SQLAlchemyError on init async-engine: {e}")
                 raise
@@ -36,18 +85,203 @@ class DataBaseConfig:
                 raise
         return self._async_session
     
-    async def connect(self) -> None:
+    @property
+    def read_engine(self) -> AsyncEngine:
+        if not self.is_split:
+            return self.async_engine
+        if self._read_engine is None:
+            try:
+                self._read_engine = create_async_engine(
+                    self._url_database,
+                    **self._pool_options(
+                        pool_size=int(os.getenv("DB_READ_POOL_SIZE", 4)),
+                        max_overflow=int(os.getenv("DB_READ_POOL_MAX_OVERFLOW", 4)),
+                    ),
+                )
+                if self._tuning is not None:
+                    event.listen(self._read_engine.sync_engine, "connect", self._tuning.apply_read_only)
+            except SQLAlchemyError as e:
+                logger.exception(f"SQLAlchemyError on init read-engine: {e}")
+                raise
+        return self._read_engine
+    
+    @property
+    def read_session(self) -> async_sessionmaker[AsyncSession]:
+        if not self.is_split:
+            return self.async_session
+        if self._read_session is None:
+            try:
+                self._read_session = async_sessionmaker(
+                    self.read_engine, expire_on_commit=False,
+                )
+            except SQLAlchemyError as e:
+                logger.exception(f"SQLAlchemyError on init read-session: {e}")
+                raise
+        return self._read_session
+    
+    @property
+    def group_commit(self) -> Optional[GroupCommitter]:
+        """Write coalescer, None unless DB_GROUP_COMMIT=1 or the split topology is used"""
+        if self._group_commit is None and self._group_commit_enabled:
+            self._group_commit = GroupCommitter(
+                self.async_session,
+                window_ms=float(os.getenv("DB_GROUP_COMMIT_WINDOW_MS", 2)),
+                max_batch=int(os.getenv("DB_GROUP_COMMIT_MAX_BATCH", 64)),
+            )
+        return self._group_commit
+    
+    def pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """Connection pool occupancy per engine role, only for engines already created"""
+        engines = {"writer": self._async_engine, "reader": self._read_engine}
+        stats = {}
+        for role, engine in engines.items():
+            pool = engine.pool if engine is not None else None
+            if pool is None or not hasattr(pool, "checkedout"):
+                continue
+            stats[role] = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        return stats
+    
+    async def connect(self, mode: str = "full") -> None:
+        """"full" always runs create_all; "fast" skips it when the stored schema fingerprint matches"""
         try:
             async with self.async_engine.begin() as conn:
-                await conn.run_sync(Base.metadata.create_all)
-                logger.info("database connect successfully")
+                fingerprint = schema_fingerprint()
+                if mode == "fast" and await self._stored_fingerprint(conn) == fingerprint:
+                    logger.info(f"schema version {fingerprint} is current, skipping create_all")
+                else:
+                    counters_existed = await self._has_table(conn, PostCounter.__tablename__)
+                    await conn.run_sync(Base.metadata.create_all)
+                    if self.is_sqlite:
+                        await conn.run_sync(self._rekey_posts)
+                    await conn.run_sync(self._add_missing_columns)
+                    await conn.run_sync(self._create_missing_indexes)
+                    if not counters_existed:
+                        await self._backfill_post_counters(conn)
+                    if self.is_sqlite:
+                        await self._create_search_index(conn)
+                    await conn.execute(delete(SchemaVersion))
+                    await conn.execute(insert(SchemaVersion).values(
+                        id=1, fingerprint=fingerprint, applied_at=datetime.now(timezone.utc),
+                    ))
+                    logger.info(f"schema created/verified, version {fingerprint} recorded")
+                if self._tuning is not None:
+                    in_effect = {}
+                    for name in self._tuning.pragmas():
+                        result = await conn.exec_driver_sql(f"PRAGMA {name}")
+                        in_effect[name] = result.scalar()
+                    logger.info(f"sqlite pragmas in effect: {in_effect}")
+                logger.info(f"database connect successfully ({self._topology} topology)")
         except Exception as e:
             logger.exception(f"connect error: {e}")
             raise
     
+    @staticmethod
+    async def _has_table(conn, name: str) -> bool:
+        #a single has_table probe, not a reflection of the whole schema
+        return await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(name))
+    
+    @staticmethod
+    async def _backfill_post_counters(conn) -> None:
+        #one GROUP BY over posts when the counters table is first created; add_post keeps it current after that
+        counts = select(
+            UserPosts.user_id, UserPosts.status, func.count(),
+        ).group_by(UserPosts.user_id, UserPosts.status)
+        result = await conn.execute(
+            insert(PostCounter).from_select(["user_id", "status", "count"], counts)
+        )
+        logger.info(f"post counters backfilled ({result.rowcount} rows)")
+    
+    @classmethod
+    async def _create_search_index(cls, conn) -> None:
+        #a freshly created index is filled from posts once; the triggers keep it current after that
+        existed = await cls._has_table(conn, POSTS_FTS_TABLE)
+        for statement in POSTS_FTS_DDL:
+            await conn.exec_driver_sql(statement)
+        if not existed:
+            await conn.exec_driver_sql(f"INSERT INTO {POSTS_FTS_TABLE}({POSTS_FTS_TABLE}) VALUES ('rebuild')")
+            logger.info(f"full-text index {POSTS_FTS_TABLE} created and built")
+    
+    @classmethod
+    async def _stored_fingerprint(cls, conn) -> Optional[str]:
+        if not await cls._has_table(conn, SchemaVersion.__tablename__):
+            return None
+        result = await conn.execute(select(SchemaVersion.fingerprint).where(SchemaVersion.id == 1))
+        return result.scalar_one_or_none()
+    
+    async def warm_pool(self, connections: int) -> int:
+        """Open `connections` pooled connections at once (per engine) so requests do not pay for them"""
+        engines = [self.async_engine] + ([self.read_engine] if self.is_split else [])
+        opened = 0
+        for engine in engines:
+            count = min(connections, engine.pool.size()) if hasattr(engine.pool, "size") else connections
+            conns = []
+            try:
+                for _ in range(count):
+                    conn = await engine.connect()
+                    conns.append(conn)
+                    await conn.execute(text("SELECT 1"))
+                opened += len(conns)
+            finally:
+                await asyncio.gather(*(conn.close() for conn in conns))
+        return opened
+    
+    @staticmethod
+    def _rekey_posts(conn) -> None:
+        #posts created before the posts.id surrogate: copy the rows into the new layout, keeping
+        #each row's current rowid as its id, and drop the full-text index so it is rebuilt on id
+        table = UserPosts.__table__
+        existing = [column["name"] for column in inspect(conn).get_columns(table.name)]
+        if "id" in existing:
+            return
+        legacy = f"{table.name}_legacy"
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {POSTS_FTS_TABLE}")
+        for trigger in POSTS_FTS_TRIGGERS:
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+        for index in inspect(conn).get_indexes(table.name):
+            conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{index["name"]}"')
+        conn.exec_driver_sql(f'ALTER TABLE "{table.name}" RENAME TO "{legacy}"')
+        table.create(conn)
+        columns = ", ".join(f'"{name}"' for name in existing if name in table.columns)
+        result = conn.exec_driver_sql(
+            f'INSERT INTO "{table.name}" (id, {columns}) SELECT rowid, {columns} FROM "{legacy}"'
+        )
+        conn.exec_driver_sql(f'DROP TABLE "{legacy}"')
+        logger.info(f"{table.name} re-keyed on an id column ({result.rowcount} rows)")
+    
+    @staticmethod
+    def _add_missing_columns(conn) -> None:
+        #create_all also skips columns added to existing tables; nullable ones can be appended in place
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not column.nullable:
+                    raise RuntimeError(f"cannot add NOT NULL column {table.name}.{column.name} in place")
+                conn.exec_driver_sql(
+                    f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column.type.compile(dialect=conn.dialect)}'
+                )
+                logger.info(f"added column {table.name}.{column.name}")
+    
+    @staticmethod
+    def _create_missing_indexes(conn) -> None:
+        #create_all skips indexes added to tables that already exist
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+    
     async def disconnect(self) -> None:
         try:
+            if self._group_commit is not None:
+                await self._group_commit.stop()
             await self.async_engine.dispose()
+            if self._read_engine is not None:
+                await self._read_engine.dispose()
             logger.info("database disconnect successfully")
         except Exception as e:
             logger.exception(f"disconnect error: {e}")
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from typing import Any, Dict
+
+import os
+
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORES = {"DEFAULT", "FILE", "MEMORY"}
+
+#per-connection PRAGMA profile, defaults tuned for a concurrent web workload
+@dataclass(frozen=True)
+class SQLiteTuning:
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 268435456
+    cache_size: int = -65536
+    temp_store: str = "MEMORY"
+    busy_timeout: int = 5000
+
+    def __post_init__(self) -> None:
+        for name, allowed in (
+            ("journal_mode", _JOURNAL_MODES),
+            ("synchronous", _SYNCHRONOUS),
+            ("temp_store", _TEMP_STORES),
+        ):
+            value = getattr(self, name).upper()
+            if value not in allowed:
+                raise ValueError(f"Invalid SQLite {name}: {value}")
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_env(cls) -> "SQLiteTuning":
+        return cls(
+            journal_mode=os.getenv("SQLITE_JOURNAL_MODE", cls.journal_mode),
+            synchronous=os.getenv("SQLITE_SYNCHRONOUS", cls.synchronous),
+            mmap_size=int(os.getenv("SQLITE_MMAP_SIZE", cls.mmap_size)),
+            cache_size=int(os.getenv("SQLITE_CACHE_SIZE", cls.cache_size)),
+            temp_store=os.getenv("SQLITE_TEMP_STORE", cls.temp_store),
+            busy_timeout=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", cls.busy_timeout)),
+        )
+
+    def pragmas(self) -> Dict[str, Any]:
+        #busy_timeout goes first so the journal_mode switch already waits on locks
+        return {
+            "busy_timeout": self.busy_timeout,
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "mmap_size": self.mmap_size,
+            "cache_size": self.cache_size,
+            "temp_store": self.temp_store,
+        }
+
+    def apply(self, dbapi_connection: Any, _connection_record: Any = None) -> None:
+        """`connect` event listener: runs the profile on every new pool connection"""
+        self._execute(dbapi_connection, self.pragmas())
+
+    def apply_read_only(self, dbapi_connection: Any, _connection_record: Any = None) -> None:
+        """Same profile for reader connections; journal_mode is persistent and left to the writer"""
+        pragmas = self.pragmas()
+        pragmas.pop("journal_mode")
+        pragmas["query_only"] = "ON"
+        self._execute(dbapi_connection, pragmas)
+
+    @staticmethod
+    def _execute(dbapi_connection: Any, pragmas: Dict[str, Any]) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
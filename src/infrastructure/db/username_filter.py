@@ -0,0 +1,63 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import select
+
+from typing import Optional, Iterator
+
+import hashlib
+import math
+import os
+
+from src.infrastructure.log.logger import logger
+from src.infrastructure.db.models import UserModel
+
+#bloom filter over every registered username: a negative answer is definitive,
+#a positive one has to be confirmed against the unique index.
+#disabled (every name "might" exist) when other processes register users it cannot see
+class UsernameBloomFilter:
+    def __init__(self, capacity: Optional[int] = None, error_rate: Optional[float] = None) -> None:
+        self._enabled = os.getenv("USERNAME_FILTER_ENABLED", "1") == "1"
+        capacity = capacity or int(os.getenv("USERNAME_FILTER_CAPACITY", 1_000_000))
+        error_rate = error_rate or float(os.getenv("USERNAME_FILTER_ERROR_RATE", 0.01))
+        self._size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _positions(self, username: str) -> Iterator[int]:
+        digest = hashlib.blake2b(username.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self._hashes):
+            yield (h1 + i * h2) % self._size
+
+    def add(self, username: str) -> None:
+        for pos in self._positions(username):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self._count += 1
+
+    def might_contain(self, username: str) -> bool:
+        if not self._enabled:
+            return True
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7))
+            for pos in self._positions(username)
+        )
+
+    async def load(self, async_factory: async_sessionmaker[AsyncSession], chunk_size: int = 10_000) -> None:
+        if not self._enabled:
+            logger.info("username filter disabled, every lookup goes to the database")
+            return
+        try:
+            async with async_factory() as session:
+                result = await session.stream_scalars(
+                    select(UserModel.username).execution_options(yield_per=chunk_size)
+                )
+                async for username in result:
+                    self.add(username)
+            logger.info(f"username filter loaded with {self._count} usernames")
+        except Exception as e:
+            logger.exception(f"username filter load error: {e}")
+            raise
@@ -0,0 +1,37 @@
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator
+
+import time
+
+from src.infrastructure.log.logger import logger
+
+#startup/shutdown state of this worker, reported by GET /system/ready
+class Readiness:
+    def __init__(self) -> None:
+        self._state = "starting"
+        self._phases: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    @property
+    def is_ready(self) -> bool:
+        return self._state == "ready"
+
+    @asynccontextmanager
+    async def phase(self, name: str) -> AsyncIterator[None]:
+        """Time one startup step and log it"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases[name] = round(time.perf_counter() - started, 6)
+            logger.info(f"startup phase '{name}' took {self._phases[name] * 1000:.1f}ms")
+
+    def mark_ready(self) -> None:
+        self._state = "ready"
+        logger.info(f"worker ready after {(time.perf_counter() - self._started) * 1000:.1f}ms")
+
+    def mark_draining(self) -> None:
+        self._state = "draining"
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"status": self._state, "phases_seconds": dict(self._phases)}
@@ -0,0 +1,123 @@
+from datetime import datetime, timezone
+from typing import Callable, Awaitable, Dict, List, Any, Optional
+from uuid import uuid4
+
+import asyncio
+import json
+import os
+import socket
+import time
+
+from src.infrastructure.log.logger import logger
+from src.infrastructure.db.repository.outbox_repository import OutboxRepository
+
+EventHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+#drains the outbox in batches and hands each event's to_dict() to its handlers.
+#delivery is at-least-once: a row is marked only after every handler succeeded.
+#each batch is leased to this dispatcher first, so workers sharing the database do not deliver it twice
+class OutboxDispatcher:
+    def __init__(
+            self,
+            repo: OutboxRepository,
+            batch_size: int = 100,
+            poll_interval: float = 0.5,
+            max_attempts: int = 10,
+            lease_seconds: float = 30.0,
+    ) -> None:
+        self._repo = repo
+        self._lease_seconds = lease_seconds
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._max_attempts = max_attempts
+        self._handlers: Dict[str, List[EventHandler]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+        self._dispatched_total = 0
+        self._failed_total = 0
+        self._last_lag_seconds = 0.0
+        self._last_batch_seconds = 0.0
+
+    def register(self, event_type: str, handler: EventHandler) -> None:
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"outbox dispatcher started (batch_size={self._batch_size}, poll={self._poll_interval}s)")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+        logger.info("outbox dispatcher stopped")
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                dispatched = await self.dispatch_batch()
+            except Exception as e:
+                logger.exception(f"outbox dispatch error: {e}")
+                dispatched = 0
+            if dispatched < self._batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self._poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def dispatch_batch(self) -> int:
+        started = time.perf_counter()
+        events = await self._repo.claim_pending(
+            self._worker_id, self._batch_size, self._max_attempts, self._lease_seconds,
+        )
+        if not events:
+            self._last_lag_seconds = 0.0
+            return 0
+
+        delivered: List[int] = []
+        errors: Dict[int, str] = {}
+        for event in events:
+            #a row that cannot even be decoded fails alone, like a handler error
+            try:
+                payload = json.loads(event.payload)
+                for handler in self._handlers.get(event.event_type, []):
+                    await handler(payload)
+                delivered.append(event.id)
+            except Exception as e:
+                logger.warning(f"outbox handler failed for event '{event.event_id}': {e}")
+                errors[event.id] = str(e)
+
+        await self._repo.mark_dispatched(delivered)
+        await self._repo.mark_failed(errors, self._max_attempts)
+
+        self._dispatched_total += len(delivered)
+        self._failed_total += len(errors)
+        occurred_at = events[0].occurred_at
+        if occurred_at.tzinfo is None:
+            occurred_at = occurred_at.replace(tzinfo=timezone.utc)
+        self._last_lag_seconds = (datetime.now(timezone.utc) - occurred_at).total_seconds()
+        self._last_batch_seconds = time.perf_counter() - started
+        return len(events)
+
+    async def stats(self) -> Dict[str, Any]:
+        pending = await self._repo.pending_stats()
+        oldest = pending["oldest_occurred_at"]
+        if oldest is not None and oldest.tzinfo is None:
+            oldest = oldest.replace(tzinfo=timezone.utc)
+        return {
+            "pending": pending["pending"],
+            "dead_lettered": pending["dead_lettered"],
+            "oldest_pending_age_seconds": (
+                round((datetime.now(timezone.utc) - oldest).total_seconds(), 3) if oldest else 0.0
+            ),
+            "last_lag_seconds": round(self._last_lag_seconds, 3),
+            "last_batch_seconds": round(self._last_batch_seconds, 6),
+            "dispatched_total": self._dispatched_total,
+            "failed_total": self._failed_total,
+            "handlers": {event_type: len(handlers) for event_type, handlers in self._handlers.items()},
+        }
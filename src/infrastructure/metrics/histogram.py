@@ -0,0 +1,41 @@
+from bisect import bisect_left
+from typing import Sequence, Dict, Any, List
+
+#fixed-bucket histogram: observe() is a bisect and two additions
+class Histogram:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self._bounds: List[float] = sorted(buckets)
+        self._counts: List[int] = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self._sum += value
+        self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def cumulative(self) -> List[tuple]:
+        """(upper bound, cumulative count) pairs, ending with +Inf"""
+        total, result = 0, []
+        for bound, count in zip(self._bounds + [float("inf")], self._counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self._count,
+            "sum": round(self._sum, 6),
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in self.cumulative()
+            },
+        }
@@ -0,0 +1,149 @@
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Any
+
+import functools
+import inspect
+import time
+
+from src.infrastructure.metrics.histogram import Histogram
+
+#(labels, value) pairs produced by a gauge or counter callback at scrape time
+Samples = Iterable[Tuple[Dict[str, str], float]]
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    body = ",".join(
+        f'{key}="{_escape(str(value))}"' for key, value in labels.items()
+    )
+    return "{" + body + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+class LabeledHistogram:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.name, self.help, self._labelnames = name, help, tuple(labelnames)
+        self._buckets = buckets
+        self._children: Dict[Tuple[str, ...], Histogram] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(labels[name] for name in self._labelnames)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = Histogram(self._buckets)
+        child.observe(value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, child in self._children.items():
+            lines.extend(render_histogram(self.name, child, dict(zip(self._labelnames, key))))
+        return lines
+
+def render_histogram(name: str, histogram: Histogram, labels: Optional[Dict[str, str]] = None) -> List[str]:
+    labels = labels or {}
+    lines = [
+        f"{name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {count}"
+        for bound, count in histogram.cumulative()
+    ]
+    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+    return lines
+
+class Gauge:
+    TYPE = "gauge"
+
+    def __init__(self, name: str, help: str, collect: Callable[[], Samples]) -> None:
+        self.name, self.help, self._collect = name, help, collect
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.TYPE}"]
+        for labels, value in self._collect():
+            lines.append(f"{self.name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+#a monotonic total read at scrape time from the component that counts it
+class Counter(Gauge):
+    TYPE = "counter"
+
+#process-wide registry rendered as Prometheus text by GET /metrics
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Any] = {}
+        self._renderers: List[Callable[[], List[str]]] = []
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> LabeledHistogram:
+        return self._metrics.setdefault(name, LabeledHistogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, collect: Callable[[], Samples]) -> Gauge:
+        return self.add(Gauge(name, help, collect))
+
+    def counter(self, name: str, help: str, collect: Callable[[], Samples]) -> Counter:
+        return self.add(Counter(name, help, collect))
+
+    def add(self, metric: Gauge) -> Gauge:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def add_renderer(self, renderer: Callable[[], List[str]]) -> None:
+        """Extra exposition lines for metrics owned elsewhere (e.g. existing Histogram objects)"""
+        self._renderers.append(renderer)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        for renderer in self._renderers:
+            lines.extend(renderer())
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+SPAN_SECONDS = metrics.histogram(
+    "app_span_duration_seconds", "Duration of instrumented internal operations", ("span", "outcome"),
+)
+
+def timed(span: str) -> Callable:
+    """Record the wrapped call's duration under app_span_duration_seconds{span=...}"""
+    def decorator(func: Callable) -> Callable:
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def agen_wrapper(*args, **kwargs):
+                started, outcome = time.perf_counter(), "error"
+                try:
+                    async for item in func(*args, **kwargs):
+                        yield item
+                    outcome = "ok"
+                finally:
+                    SPAN_SECONDS.observe(time.perf_counter() - started, span=span, outcome=outcome)
+            return agen_wrapper
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started, outcome = time.perf_counter(), "error"
+                try:
+                    result = await func(*args, **kwargs)
+                    outcome = "ok"
+                    return result
+                finally:
+                    SPAN_SECONDS.observe(time.perf_counter() - started, span=span, outcome=outcome)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            started, outcome = time.perf_counter(), "error"
+            try:
+                result = func(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                SPAN_SECONDS.observe(time.perf_counter() - started, span=span, outcome=outcome)
+        return sync_wrapper
+    return decorator
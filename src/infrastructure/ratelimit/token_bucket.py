@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Any, Optional
+
+import math
+import time
+
+@dataclass(frozen=True, slots=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_seconds: int
+    retry_after: int
+
+#token buckets keyed by e.g. "add_user:203.0.113.7". acquire() never awaits, so on one
+#event loop it is atomic without locks. Keys are spread over shards and every
+#`sweep_every` calls one shard is swept for buckets that are full again and idle:
+#a full bucket is indistinguishable from a missing one, so dropping it is free
+class TokenBucketLimiter:
+    def __init__(self, shards: int = 16, idle_seconds: float = 300.0, sweep_every: int = 1024) -> None:
+        self._shards: List[Dict[str, Tuple[float, float, float]]] = [{} for _ in range(shards)]
+        self._idle_seconds = idle_seconds
+        self._sweep_every = sweep_every
+        self._calls = 0
+        self._next_sweep = 0
+
+        self._allowed_total = 0
+        self._limited_total = 0
+        self._evicted_total = 0
+
+    def acquire(
+            self,
+            key: str,
+            capacity: float,
+            refill_per_second: float,
+            cost: float = 1.0,
+            now: Optional[float] = None,
+    ) -> RateLimitDecision:
+        now = time.monotonic() if now is None else now
+        shard = self._shards[hash(key) % len(self._shards)]
+        bucket = shard.get(key)
+        if bucket is None:
+            tokens = capacity
+        else:
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_per_second)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+            self._allowed_total += 1
+        else:
+            self._limited_total += 1
+        #(tokens, last update, moment the bucket is full again)
+        shard[key] = (tokens, now, now + (capacity - tokens) / refill_per_second)
+
+        self._calls += 1
+        if self._calls % self._sweep_every == 0:
+            self._sweep(now)
+
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=int(capacity),
+            remaining=max(0, int(tokens)),
+            reset_seconds=math.ceil((capacity - tokens) / refill_per_second),
+            retry_after=0 if allowed else math.ceil((cost - tokens) / refill_per_second),
+        )
+
+    def _sweep(self, now: float) -> None:
+        shard = self._shards[self._next_sweep]
+        self._next_sweep = (self._next_sweep + 1) % len(self._shards)
+        idle = [
+            key for key, (_, updated, full_at) in shard.items()
+            if full_at <= now and now - updated >= self._idle_seconds
+        ]
+        for key in idle:
+            del shard[key]
+        self._evicted_total += len(idle)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "buckets": sum(len(shard) for shard in self._shards),
+            "shards": len(self._shards),
+            "allowed_total": self._allowed_total,
+            "limited_total": self._limited_total,
+            "evicted_total": self._evicted_total,
+        }
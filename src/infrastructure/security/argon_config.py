@@ -1,36 +1,173 @@
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
 
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Any, Dict
+
+import asyncio
+import math
+import multiprocessing
+import os
+import secrets
+import time
 
 from src.infrastructure.log.logger import logger
+from src.infrastructure.security.hashing_governor import HashingGovernor
+from src.infrastructure.metrics.registry import timed
 from src.domain.protocols.argon_config_protocol import ArgonConfigProtocol
 
+#hasher living inside each pool worker, built once by the initializer
+_worker_ph: Optional[PasswordHasher] = None
+
+def _init_worker(params: Dict[str, Any]) -> None:
+    global _worker_ph
+    _worker_ph = PasswordHasher(**params)
+
+def _hash_in_worker(password: str) -> str:
+    return _worker_ph.hash(password)
+
+def _verify_in_worker(hashed: str, password: str) -> bool:
+    try:
+        return _worker_ph.verify(hashed, password)
+    except VerifyMismatchError:
+        return False
+
+def _warm_worker() -> int:
+    return os.getpid()
+
+#lowest memory cost calibration may fall back to (OWASP minimum for argon2id)
+MIN_MEMORY_COST_KIB = 19456
+
 class ArgonHashConfig(ArgonConfigProtocol):
-    def __init__(self) -> None:
+    def __init__(self, max_workers: Optional[int] = None) -> None:
         self._ph: Optional[PasswordHasher] = None
-    
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._governor: Optional[HashingGovernor] = None
+        self._dummy_hash: Optional[str] = None
+        self._max_workers = max_workers or int(
+            os.getenv("ARGON_MAX_WORKERS", os.cpu_count() or 1)
+        )
+        self._params: Dict[str, Any] = {
+            "time_cost": int(os.getenv("ARGON_TIME_COST", 4)),
+            "parallelism": int(os.getenv("ARGON_PARALLELISM", 4)),
+            "hash_len": 32, "salt_len": 16,
+            "memory_cost": int(os.getenv("ARGON_MEMORY_COST", 102400)),
+        }
+
     @property
     def ph(self) -> PasswordHasher:
         if self._ph is None:
             try:
-                self._ph = PasswordHasher(
-                    time_cost=4, parallelism=4,
-                    hash_len=32, salt_len=16,
-                    memory_cost=102400,
-                )
+                self._ph = PasswordHasher(**self._params)
             except Exception as e:
                 logger.exception("error in init argon-ph")
                 raise
         return self._ph
-    
-    def hash(self, password: str) -> str:
-        return self.ph.hash(password)
-    
-    def verify(self, hashed: str, password: str) -> bool:
-        try:
-            return self.ph.verify(
-                hashed, password,
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            try:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self._params,),
+                )
+            except Exception as e:
+                logger.exception(f"error in init argon process pool: {e}")
+                raise
+        return self._pool
+
+    @property
+    def governor(self) -> HashingGovernor:
+        if self._governor is None:
+            task_memory_kib = self._params["memory_cost"]
+            self._governor = HashingGovernor(
+                memory_budget_kib=int(os.getenv(
+                    "ARGON_MEMORY_BUDGET_KIB", task_memory_kib * self._max_workers,
+                )),
+                task_memory_kib=task_memory_kib,
+                max_queue=int(os.getenv("ARGON_MAX_QUEUE", 64)),
             )
-        except VerifyMismatchError:
-            return False
\ No newline at end of file
+        return self._governor
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return dict(self._params)
+
+    def _measure_p99_ms(self, time_cost: int, memory_cost: int, samples: int) -> float:
+        ph = PasswordHasher(**{**self._params, "time_cost": time_cost, "memory_cost": memory_cost})
+        timings = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            ph.hash("calibration-password")
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        return timings[min(len(timings) - 1, math.ceil(0.99 * len(timings)) - 1)]
+
+    def calibrate(self, target_ms: float, max_memory_kib: int, samples: int = 5) -> Dict[str, Any]:
+        """Pick the strongest time_cost/memory_cost whose p99 stays under target_ms on this machine"""
+        if self._pool is not None or self._governor is not None:
+            raise RuntimeError("calibration must run before the hashing pool is started")
+        memory_cost = max_memory_kib
+        while True:
+            per_pass_ms = self._measure_p99_ms(1, memory_cost, samples)
+            if per_pass_ms <= target_ms or memory_cost <= MIN_MEMORY_COST_KIB:
+                break
+            memory_cost = max(MIN_MEMORY_COST_KIB, memory_cost // 2)
+
+        time_cost = max(1, int(target_ms // per_pass_ms))
+        while time_cost > 1 and self._measure_p99_ms(time_cost, memory_cost, samples) > target_ms:
+            time_cost -= 1
+
+        self._params.update(time_cost=time_cost, memory_cost=memory_cost)
+        self._ph = None
+        logger.info(f"argon calibrated to time_cost={time_cost} memory_cost={memory_cost}KiB for p99<={target_ms}ms")
+        return self.params
+
+    def calibrate_from_env(self) -> Dict[str, Any]:
+        return self.calibrate(
+            target_ms=float(os.getenv("ARGON_TARGET_P99_MS", 250)),
+            max_memory_kib=int(os.getenv("ARGON_CALIBRATE_MAX_MEMORY_KIB", self._params["memory_cost"])),
+            samples=int(os.getenv("ARGON_CALIBRATE_SAMPLES", 5)),
+        )
+
+    async def start(self) -> None:
+        """Spawn every pool worker up front so the first request does not pay for it"""
+        if os.getenv("ARGON_CALIBRATE", "0") == "1":
+            await asyncio.to_thread(self.calibrate_from_env)
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(
+            loop.run_in_executor(self.pool, _warm_worker)
+            for _ in range(self._max_workers)
+        ))
+        logger.info(f"argon process pool started with {len(set(pids))} workers")
+        await self.dummy_hash()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+            logger.info("argon process pool shut down")
+
+    @timed("argon.hash")
+    async def hash(self, password: str) -> str:
+        async with self.governor.admit():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, _hash_in_worker, password)
+
+    async def dummy_hash(self) -> str:
+        """Hash of a random secret under the current parameters, verified against for unknown usernames"""
+        if self._dummy_hash is None:
+            self._dummy_hash = await self.hash(secrets.token_urlsafe(32))
+        return self._dummy_hash
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return self.ph.check_needs_rehash(hashed)
+
+    @timed("argon.verify")
+    async def verify(self, hashed: str, password: str) -> bool:
+        async with self.governor.admit():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, _verify_in_worker, hashed, password)
@@ -1,16 +1,32 @@
-from authx import AuthX, AuthXConfig
+from authx import AuthX, AuthXConfig, TokenPayload, RequestToken
+from authx.exceptions import RevokedTokenError
+from fastapi import Request
 
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Dict, Any
+from uuid import uuid4
+
+import time
+
+import jwt
+
+import os
 
 from src.infrastructure.log.logger import logger
 from src.domain.protocols.authx_service_protocol import AuthxServiceProtocol
+from src.infrastructure.security.token_cache import TokenPayloadCache
+from src.infrastructure.security.denylist import TokenDenylist
+from src.infrastructure.db.repository.denylist_repository import DenylistRepository
+from src.infrastructure.metrics.registry import timed
 
 #service for creating JWT tokens
 class AuthxService(AuthxServiceProtocol):
-    def __init__(self) -> None:
+    def __init__(self, denylist_store: Optional[DenylistRepository] = None) -> None:
         self._config: Optional[AuthXConfig] = None
         self._authx: Optional[AuthX] = None
+        self._token_cache: Optional[TokenPayloadCache] = None
+        self._denylist: Optional[TokenDenylist] = None
+        self._denylist_store = denylist_store
     
     @property
     def config(self) -> AuthXConfig:
@@ -20,6 +36,7 @@ class AuthxService(AuthxServiceProtocol):
                 self._config = AuthXConfig()
                 self._config.JWT_ALGORITHM = "HS256"
                 self._config.JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=3)
+                self._config.JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=int(os.getenv("JWT_REFRESH_TOKEN_DAYS", 14)))
                 self._config.JWT_TOKEN_LOCATION = ["headers"]
                 self._config.JWT_SECRET_KEY = "SECRET_KEY"
                 logger.info("AuthxService initialized")
@@ -36,18 +53,136 @@ class AuthxService(AuthxServiceProtocol):
                 self._authx = AuthX(
                     config=self.config,
                 )
+                self._authx.set_callback_token_blocklist(self._is_token_revoked)
                 logger.info("Authx instance initialized")
             except Exception as e:
                 logger.exception(f"Error in Authx initialization: {e}")
                 raise
         return self._authx
     
+    @property
+    def token_cache(self) -> TokenPayloadCache:
+        if self._token_cache is None:
+            self._token_cache = TokenPayloadCache(
+                max_entries=int(os.getenv("JWT_CACHE_MAX_ENTRIES", 10000)),
+                max_ttl_seconds=float(os.getenv("JWT_CACHE_TTL_SECONDS", 300)),
+            )
+        return self._token_cache
+    
+    @property
+    def denylist(self) -> TokenDenylist:
+        if self._denylist is None:
+            self._denylist = TokenDenylist(
+                self._denylist_store,
+                sync_interval=float(os.getenv("DENYLIST_SYNC_INTERVAL_MS", 1000)) / 1000,
+            )
+        return self._denylist
+    
+    #authx blocklist callback for its own dependencies; only reads the jti and fam claims,
+    #the signature is verified separately by whoever asked
+    def _is_token_revoked(self, token: str, **kwargs) -> bool:
+        try:
+            claims = jwt.decode(token, options={"verify_signature": False})
+            return self._is_revoked(TokenPayload(**claims))
+        except Exception:
+            return False
+    
+    #a token is dead when its own jti is revoked or when its whole login family is
+    def _is_revoked(self, payload: TokenPayload) -> bool:
+        family = self.token_family(payload)
+        return self.denylist.is_revoked(payload.jti) or (
+            family is not None and self.denylist.is_revoked(f"fam:{family}")
+        )
+    
+    @staticmethod
+    def token_family(payload: TokenPayload) -> Optional[str]:
+        return getattr(payload, "fam", None)
+    
+    @staticmethod
+    def new_token_family() -> str:
+        return uuid4().hex
+    
+    @staticmethod
+    def _family_claims(family: Optional[str]) -> Optional[Dict[str, Any]]:
+        return {"fam": family} if family is not None else None
+    
+    #dependency verifying the request's access token, skipping the signature check for recently seen tokens
+    async def access_token_required(self, request: Request) -> TokenPayload:
+        self.authx.ensure_request_exception_handlers(request)
+        request_token = await self.authx.get_access_token_from_request(request)
+
+        #only header tokens are cached: cookie tokens also carry a per-request CSRF check
+        cacheable = request_token.location == "headers"
+        payload = self.token_cache.get(request_token.token) if cacheable else None
+        if payload is None:
+            payload = self.authx.verify_token(
+                request_token,
+                verify_type=True,
+                verify_fresh=False,
+                verify_csrf=self.config.JWT_COOKIE_CSRF_PROTECT and request.method.upper() in self.config.JWT_CSRF_METHODS,
+            )
+            if cacheable:
+                self.token_cache.set(request_token.token, payload)
+
+        #revocation is never cached: dict lookups on the jti and family, on every request
+        if self._is_revoked(payload):
+            self.token_cache.discard(request_token.token)
+            raise RevokedTokenError("Token has been revoked")
+        return payload
+    
+    #dependency verifying the request's refresh token. A spent jti is let through on purpose:
+    #the refresh handle's atomic revoke detects the reuse and revokes the whole family
+    async def refresh_token_required(self, request: Request) -> TokenPayload:
+        self.authx.ensure_request_exception_handlers(request)
+        request_token = await self.authx.get_refresh_token_from_request(request)
+        payload = self.authx.verify_token(request_token, verify_type=True, verify_csrf=False)
+        family = self.token_family(payload)
+        if family is not None and self.denylist.is_revoked(f"fam:{family}"):
+            raise RevokedTokenError("Token has been revoked")
+        return payload
+    
+    #verifies a refresh token passed in a request body rather than the Authorization header
+    def decode_refresh_token(self, token: str) -> TokenPayload:
+        return self.authx.verify_token(
+            RequestToken(token=token, location="headers", type="refresh"),
+            verify_type=True, verify_csrf=False,
+        )
+    
+    async def revoke(self, payload: TokenPayload) -> bool:
+        """False when the token had already been revoked"""
+        exp = payload.exp
+        expires_at = exp.timestamp() if isinstance(exp, datetime) else float(exp)
+        return await self.denylist.revoke(payload.jti, expires_at)
+    
+    #kills every token issued from the same login, for as long as any of them can live
+    async def revoke_family(self, payload: TokenPayload) -> None:
+        family = self.token_family(payload)
+        if family is not None:
+            lifetime = max(self.config.JWT_REFRESH_TOKEN_EXPIRES, self.config.JWT_ACCESS_TOKEN_EXPIRES)
+            await self.denylist.revoke(f"fam:{family}", time.time() + lifetime.total_seconds())
+    
+    #build the authx instance and run one sign/verify round trip before the first request
+    def warm(self) -> None:
+        token = self.authx.create_access_token(uid="warmup")
+        self.authx.verify_token(RequestToken(token=token, location="headers", type="access"), verify_csrf=False)
+    
     #function to create a JWT token
-    def create_access_token(self, uid: str) -> str:
+    @timed("authx.create_access_token")
+    def create_access_token(self, uid: str, family: Optional[str] = None) -> str:
         try:
             return self.authx.create_access_token(
-                uid=uid
+                uid=uid, data=self._family_claims(family),
             )
         except Exception as e:
             logger.exception(f"Error in creating token: {e}")
+            raise
+    
+    #function to create a long-lived refresh token; every refresh token belongs to a family
+    def create_refresh_token(self, uid: str, family: Optional[str] = None) -> str:
+        try:
+            return self.authx.create_refresh_token(
+                uid=uid, data=self._family_claims(family or self.new_token_family()),
+            )
+        except Exception as e:
+            logger.exception(f"Error in creating refresh token: {e}")
             raise
\ No newline at end of file
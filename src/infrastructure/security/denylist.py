@@ -0,0 +1,127 @@
+from typing import Dict, List, Tuple, Optional, Any
+
+import asyncio
+import heapq
+import time
+
+from src.infrastructure.log.logger import logger
+from src.infrastructure.db.repository.denylist_repository import DenylistRepository
+
+#revoked token ids: a dict answers membership in O(1), a min-heap on expiry lets
+#eviction drop exactly the entries whose tokens have expired, so memory tracks live revocations.
+#the database copy rebuilds it on restart and carries revocations between workers
+class TokenDenylist:
+    def __init__(
+            self,
+            store: Optional[DenylistRepository] = None,
+            sync_interval: float = 1.0,
+            purge_interval: float = 600.0,
+    ) -> None:
+        self._store = store
+        self._sync_interval = sync_interval
+        self._purge_interval = purge_interval
+        self._entries: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._last_id = 0
+        self._last_purge = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+        self._revoked_total = 0
+        self._evicted_total = 0
+        self._synced_total = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if jti is None:
+            return False
+        expires_at = self._entries.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def _remember(self, jti: str, expires_at: float) -> None:
+        if self._entries.get(jti, 0.0) >= expires_at:
+            return
+        self._entries[jti] = expires_at
+        heapq.heappush(self._heap, (expires_at, jti))
+
+    def evict_expired(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        evicted = 0
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, jti = heapq.heappop(self._heap)
+            #a later, longer revocation of the same jti leaves a stale heap entry behind
+            if self._entries.get(jti) == expires_at:
+                del self._entries[jti]
+                evicted += 1
+        self._evicted_total += evicted
+        return evicted
+
+    async def revoke(self, jti: str, expires_at: float) -> bool:
+        """Deny `jti` until `expires_at` (unix seconds), locally at once and durably in the store.
+        False when it was already revoked, here or (through the store's unique jti) on another worker"""
+        if expires_at <= time.time():
+            return False
+        already_revoked = self.is_revoked(jti)
+        self._remember(jti, expires_at)
+        self._revoked_total += 1
+        self.evict_expired()
+        if already_revoked:
+            return False
+        if self._store is not None:
+            return await self._store.add(jti, expires_at)
+        return True
+
+    async def sync(self) -> int:
+        """Pull revocations recorded since the last sync, including other workers' ones"""
+        if self._store is None:
+            return 0
+        now = time.time()
+        rows = await self._store.fetch_since(self._last_id, now)
+        for row_id, jti, expires_at in rows:
+            self._remember(jti, expires_at)
+            self._last_id = max(self._last_id, row_id)
+        self._synced_total += len(rows)
+        self.evict_expired(now)
+        if now - self._last_purge >= self._purge_interval:
+            await self._store.purge_expired(now)
+            self._last_purge = now
+        return len(rows)
+
+    async def load(self) -> None:
+        loaded = await self.sync()
+        logger.info(f"token denylist loaded with {loaded} live revocations")
+
+    def start(self) -> None:
+        if self._task is None and self._store is not None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self._sync_interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.exception(f"token denylist sync error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "heap_size": len(self._heap),
+            "revoked_total": self._revoked_total,
+            "evicted_total": self._evicted_total,
+            "synced_total": self._synced_total,
+            "sync_interval_seconds": self._sync_interval,
+        }
@@ -0,0 +1,103 @@
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Any
+
+import asyncio
+import math
+import time
+
+class HashingOverloadedError(Exception):
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Password hashing is overloaded, retry later")
+        self.retry_after = retry_after
+
+#global admission control: every hash costs `task_memory_kib`, the budget caps
+#how many may run at once and `max_queue` caps how many may wait for a slot
+class HashingGovernor:
+    def __init__(self, memory_budget_kib: int, task_memory_kib: int, max_queue: int) -> None:
+        self._task_memory_kib = task_memory_kib
+        self._slots = max(1, memory_budget_kib // task_memory_kib)
+        self._max_queue = max_queue
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        self._admitted_total = 0
+        self._rejected_total = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._avg_task_seconds = 0.0
+
+    @property
+    def slots(self) -> int:
+        return self._slots
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        await self._acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._observe_task(time.perf_counter() - started)
+            self._release()
+
+    async def _acquire(self) -> None:
+        if self._in_flight < self._slots and not self._waiters:
+            self._in_flight += 1
+            self._admitted_total += 1
+            return
+
+        if len(self._waiters) >= self._max_queue:
+            self._rejected_total += 1
+            raise HashingOverloadedError(retry_after=self._retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        queued_at = time.perf_counter()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                #the slot was already handed over to us, pass it on
+                self._release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+        waited = time.perf_counter() - queued_at
+        self._wait_seconds_total += waited
+        self._wait_seconds_max = max(self._wait_seconds_max, waited)
+        self._admitted_total += 1
+
+    def _release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                #hand the slot straight to the next waiter, in_flight is unchanged
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
+
+    def _observe_task(self, seconds: float) -> None:
+        if self._avg_task_seconds == 0.0:
+            self._avg_task_seconds = seconds
+        else:
+            self._avg_task_seconds = 0.9 * self._avg_task_seconds + 0.1 * seconds
+
+    def _retry_after(self) -> int:
+        rounds = (len(self._waiters) + self._in_flight) / self._slots
+        return max(1, math.ceil(rounds * self._avg_task_seconds))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "slots": self._slots,
+            "task_memory_kib": self._task_memory_kib,
+            "in_flight": self._in_flight,
+            "queue_depth": len(self._waiters),
+            "max_queue": self._max_queue,
+            "admitted_total": self._admitted_total,
+            "rejected_total": self._rejected_total,
+            "wait_seconds_total": round(self._wait_seconds_total, 6),
+            "wait_seconds_max": round(self._wait_seconds_max, 6),
+            "avg_task_seconds": round(self._avg_task_seconds, 6),
+        }
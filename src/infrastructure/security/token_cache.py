@@ -0,0 +1,74 @@
+from authx import TokenPayload
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Tuple, Dict, Any
+
+import hashlib
+import time
+
+#verified-token cache: maps a digest of the raw JWT to its decoded payload.
+#entries never outlive the token's own `exp`; revocation is checked by the caller on every hit
+class TokenPayloadCache:
+    def __init__(self, max_entries: int, max_ttl_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._max_ttl = max_ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[TokenPayload, float]]" = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    @staticmethod
+    def _expiry(payload: TokenPayload) -> Optional[float]:
+        exp = payload.exp
+        if exp is None:
+            return None
+        if isinstance(exp, datetime):
+            return exp.timestamp()
+        return None
+
+    def get(self, token: str) -> Optional[TokenPayload]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return payload
+
+    def set(self, token: str, payload: TokenPayload) -> None:
+        expires_at = time.time() + self._max_ttl
+        token_exp = self._expiry(payload)
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        if expires_at <= time.time():
+            return
+        key = self._key(token)
+        self._entries[key] = (payload, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def discard(self, token: str) -> None:
+        self._entries.pop(self._key(token), None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+        }
@@ -2,14 +2,28 @@ from src.infrastructure.db.session import DataBaseConfig
 from src.infrastructure.security.argon_config import ArgonHashConfig
 from src.infrastructure.security.authx_config import AuthxService
 from src.infrastructure.db.repository.user_repository import UserRepository
-from src.application.auth.handle import RegisterUserHandle
+from src.infrastructure.db.repository.outbox_repository import OutboxRepository
+from src.infrastructure.db.repository.denylist_repository import DenylistRepository
+from src.infrastructure.db.repository.search_repository import PostSearchRepository
+from src.infrastructure.messaging.outbox_dispatcher import OutboxDispatcher
+from src.application.events.handlers import register_event_handlers
+from src.infrastructure.db.username_filter import UsernameBloomFilter
+from src.infrastructure.cache.backend import CacheBackendProtocol, LRUCacheBackend
+from src.application.auth.handle import RegisterUserHandle, IngestPostsHandle
+from src.infrastructure.lifecycle.readiness import Readiness
+from src.infrastructure.ratelimit.token_bucket import TokenBucketLimiter
 
 from authx import TokenPayload
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import APIKeyHeader
 
-from typing import Annotated
+from typing import Annotated, Optional, Callable, Tuple
 from functools import lru_cache
 
+import secrets
+
+import os
+
 @lru_cache(maxsize=1)
 def get_db_config() -> DataBaseConfig:
     """Singleton database configuration"""
@@ -22,14 +36,63 @@ def get_argon_config() -> ArgonHashConfig:
 
 @lru_cache(maxsize=1)
 def get_authx_service() -> AuthxService:
-    """Singleton authx service configuration"""
-    return AuthxService()
+    """Singleton authx service configuration, with the revocation denylist persisted to the database"""
+    db = get_db_config()
+    return AuthxService(
+        denylist_store=DenylistRepository(db.async_session, group_commit=db.group_commit, read_factory=db.read_session),
+    )
+
+@lru_cache(maxsize=1)
+def get_username_filter() -> UsernameBloomFilter:
+    """Singleton username existence filter"""
+    return UsernameBloomFilter()
+
+@lru_cache(maxsize=1)
+def get_posts_cache() -> Optional[CacheBackendProtocol]:
+    """Singleton read-through cache for post listings, None when disabled"""
+    if os.getenv("POSTS_CACHE_ENABLED", "1") != "1":
+        return None
+    return LRUCacheBackend(
+        max_bytes=int(os.getenv("POSTS_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+        ttl_seconds=float(os.getenv("POSTS_CACHE_TTL_SECONDS", 30)),
+    )
+
+@lru_cache(maxsize=1)
+def get_outbox_dispatcher() -> OutboxDispatcher:
+    """Singleton domain event dispatcher draining the outbox"""
+    db = get_db_config()
+    dispatcher = OutboxDispatcher(
+        OutboxRepository(db.async_session, group_commit=db.group_commit, read_factory=db.read_session),
+        batch_size=int(os.getenv("OUTBOX_BATCH_SIZE", 100)),
+        poll_interval=float(os.getenv("OUTBOX_POLL_INTERVAL_MS", 500)) / 1000,
+        max_attempts=int(os.getenv("OUTBOX_MAX_ATTEMPTS", 10)),
+        lease_seconds=float(os.getenv("OUTBOX_LEASE_SECONDS", 30)),
+    )
+    register_event_handlers(dispatcher)
+    return dispatcher
+
+@lru_cache(maxsize=1)
+def get_readiness() -> Readiness:
+    """Singleton startup/readiness state of this worker"""
+    return Readiness()
 
 def get_user_repository(
     db: Annotated[DataBaseConfig, Depends(get_db_config)],
+    username_filter: Annotated[UsernameBloomFilter, Depends(get_username_filter)],
+    posts_cache: Annotated[Optional[CacheBackendProtocol], Depends(get_posts_cache)],
 ) -> UserRepository:
     """User repository with database session dependency"""
-    return UserRepository(db.async_session)
+    return UserRepository(
+        db.async_session, username_filter,
+        group_commit=db.group_commit, read_factory=db.read_session,
+        posts_cache=posts_cache,
+    )
+
+def get_search_repository(
+    db: Annotated[DataBaseConfig, Depends(get_db_config)],
+) -> PostSearchRepository:
+    """Full-text post search over the FTS5 index"""
+    return PostSearchRepository(db.async_session, read_factory=db.read_session)
 
 def get_register_user_handle(
     repo: Annotated[UserRepository, Depends(get_user_repository)],
@@ -41,8 +104,14 @@ def get_register_user_handle(
         repo=repo, authx=authx, hasher=hasher,
     )
 
+def get_ingest_posts_handle(
+    repo: Annotated[UserRepository, Depends(get_user_repository)],
+) -> IngestPostsHandle:
+    """Bulk post ingestion service"""
+    return IngestPostsHandle(repo=repo)
+
 def get_current_user_id(
-    payload: Annotated[TokenPayload, Depends(get_authx_service().authx.access_token_required)],
+    payload: Annotated[TokenPayload, Depends(get_authx_service().access_token_required)],
 ) -> str:
     """Extract current user identifier from JWT patload."""
     if payload.sub is None:
@@ -50,4 +119,74 @@ def get_current_user_id(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
         )
-    return str(payload.sub) 
\ No newline at end of file
+    return str(payload.sub)
+
+admin_token_header = APIKeyHeader(name="X-Admin-Token", auto_error=False)
+
+def require_admin(
+    token: Annotated[Optional[str], Depends(admin_token_header)],
+) -> None:
+    """Admin-only routes: X-Admin-Token must equal ADMIN_API_TOKEN; with no token configured they are closed"""
+    expected = os.getenv("ADMIN_API_TOKEN")
+    if not expected or token is None or not secrets.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin credentials required",
+        )
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> TokenBucketLimiter:
+    """Singleton token-bucket store shared by every rate-limited route"""
+    return TokenBucketLimiter(
+        shards=int(os.getenv("RATE_LIMIT_SHARDS", 16)),
+        idle_seconds=float(os.getenv("RATE_LIMIT_IDLE_SECONDS", 300)),
+    )
+
+def _client_ip(request: Request) -> str:
+    #each proxy appends the address it received from, so only the entries added by our own
+    #RATE_LIMIT_TRUSTED_HOPS proxies (counted from the right) are trustworthy; the rest are client-supplied
+    if os.getenv("RATE_LIMIT_TRUST_FORWARDED", "0") == "1":
+        hops = max(1, int(os.getenv("RATE_LIMIT_TRUSTED_HOPS", 1)))
+        forwarded = [entry.strip() for entry in request.headers.get("x-forwarded-for", "").split(",") if entry.strip()]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.client.host if request.client else "unknown"
+
+def _route_limit(name: str, limit: int, window_seconds: float, cost: float) -> Tuple[int, float, float]:
+    #RATE_LIMIT_<NAME>="limit/window_seconds[:cost]", e.g. RATE_LIMIT_ADD_USER="10/60:1"
+    raw = os.getenv(f"RATE_LIMIT_{name.upper()}")
+    if not raw:
+        return limit, window_seconds, cost
+    rate, _, raw_cost = raw.partition(":")
+    raw_limit, _, raw_window = rate.partition("/")
+    return int(raw_limit), float(raw_window or window_seconds), float(raw_cost or cost)
+
+def rate_limit(name: str, limit: int, window_seconds: float, cost: float = 1, by: str = "ip") -> Callable:
+    """Route dependency spending `cost` tokens from the caller's bucket (by client IP or by user id)"""
+    limit, window_seconds, cost = _route_limit(name, limit, window_seconds, cost)
+    #buckets are per process: with N workers each one enforces its share, so the total stays near `limit`
+    limit = max(1, limit // int(os.getenv("RATE_LIMIT_WORKERS", 1)))
+    refill_per_second = limit / window_seconds
+    enabled = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+
+    def check(request: Request, key: str) -> None:
+        if not enabled:
+            return
+        decision = get_rate_limiter().acquire(f"{name}:{key}", limit, refill_per_second, cost)
+        #RateLimitHeadersMiddleware turns this into RateLimit-* response headers
+        request.state.ratelimit = decision
+        if not decision.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(decision.retry_after)},
+            )
+
+    #async on purpose: sync dependencies run in the threadpool, async ones stay on the loop
+    if by == "user":
+        async def dependency(request: Request, user_id: Annotated[str, Depends(get_current_user_id)]) -> None:
+            check(request, user_id)
+    else:
+        async def dependency(request: Request) -> None:
+            check(request, _client_ip(request))
+    return dependency
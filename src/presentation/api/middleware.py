@@ -0,0 +1,72 @@
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+from starlette.datastructures import MutableHeaders
+
+import time
+
+from src.infrastructure.metrics.registry import metrics
+
+REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status"),
+)
+_in_progress = 0
+metrics.gauge(
+    "http_requests_in_progress", "HTTP requests currently being served",
+    lambda: [({}, _in_progress)],
+)
+
+#pure ASGI middleware: one perf_counter pair and one histogram observe per request,
+#labelled with the route template so path parameters do not explode cardinality
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        global _in_progress
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        _in_progress += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _in_progress -= 1
+            #the router stores the matched route in the scope; unmatched paths share one label
+            route = scope.get("route")
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code),
+            )
+
+#adds RateLimit-Limit/Remaining/Reset to any response whose route ran a rate_limit dependency,
+#including 429s and error responses raised after the check
+class RateLimitHeadersMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                decision = scope.get("state", {}).get("ratelimit")
+                if decision is not None:
+                    headers = MutableHeaders(scope=message)
+                    headers["RateLimit-Limit"] = str(decision.limit)
+                    headers["RateLimit-Remaining"] = str(decision.remaining)
+                    headers["RateLimit-Reset"] = str(decision.reset_seconds)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
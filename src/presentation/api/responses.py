@@ -0,0 +1,30 @@
+from fastapi.responses import JSONResponse
+
+from datetime import datetime
+from typing import Any
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def dumps(content: Any) -> bytes:
+    """Compact JSON bytes; orjson when installed, the stdlib encoder otherwise"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_json_default)
+    return json.dumps(
+        content, default=_json_default, ensure_ascii=False, separators=(",", ":"),
+    ).encode("utf-8")
+
+#response for payloads that are already plain dicts/lists shaped like their schema:
+#skips jsonable_encoder and response_model validation entirely
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,15 +1,23 @@
-from fastapi import APIRouter, status, Depends, HTTPException
+from fastapi import APIRouter, status, Depends, HTTPException, Query
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi.responses import StreamingResponse
+from authx import TokenPayload
+from authx.exceptions import AuthXException
 
-from typing import Annotated
+from typing import Annotated, Optional, AsyncIterator, List, Dict, Any
+from dataclasses import asdict
 
-from src.infrastructure.db.models import UserPosts
-from src.application.auth.commands import UserRegisteredCommand, ProfileRegisteredCommand, PostRegisteredcommand
-from src.presentation.schemas.user import AuthResult, UserAuthRequest, ProfileAuthRequest, ProfileAuthResult, PostAuthResult, PostAuthRequest, GetPostsByID
-from src.application.auth.handle import RegisterUserHandle
-from src.presentation.api.deps import get_register_user_handle, get_current_user_id, get_user_repository
+from src.domain.user.value_object import Status
+from src.application.auth.commands import UserRegisteredCommand, ProfileRegisteredCommand, PostRegisteredcommand, UserLoginCommand, UsersBulkRegisteredCommand, PostsIngestCommand, PostIngestItem
+from src.presentation.schemas.user import LogoutRequest, LogoutResult, AuthResult, UserAuthRequest, ProfileAuthRequest, ProfileAuthResult, PostAuthResult, PostAuthRequest, GetPostsByID, UsernameAvailableResult, UserLoginRequest, UsersBulkAuthRequest, AuthBulkResult, PostsBulkAuthRequest, PostIngestReport, PostsPage, MeResult, PostSearchPage
+from src.application.auth.handle import RegisterUserHandle, IngestPostsHandle
+from src.presentation.api.responses import FastJSONResponse, dumps
+from src.presentation.api.deps import get_register_user_handle, get_current_user_id, get_user_repository, get_ingest_posts_handle, get_authx_service, get_search_repository, rate_limit, require_admin
 
 from src.infrastructure.db.repository.user_repository import UserRepository
+from src.infrastructure.db.repository.search_repository import PostSearchRepository
+from src.infrastructure.security.hashing_governor import HashingOverloadedError
+from src.domain.user.exceptions import UserAlreadyExistsError, InvalidCredentialsError, UserNotFoundError, RefreshTokenReuseError
 
 http_bearer = HTTPBearer()
 router = APIRouter(
@@ -17,7 +25,7 @@ router = APIRouter(
 )
 
 #endpoint for adding a user
-@router.post("/add-user", status_code=status.HTTP_201_CREATED, response_model=AuthResult)
+@router.post("/add-user", status_code=status.HTTP_201_CREATED, response_model=AuthResult, dependencies=[Depends(rate_limit("add_user", 10, 60))])
 async def add_user_handler(
     request: UserAuthRequest,
     handle: Annotated[RegisterUserHandle, Depends(get_register_user_handle)],
@@ -30,6 +38,17 @@ async def add_user_handler(
             )
         )
         return user
+    except UserAlreadyExistsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
+    except HashingOverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -41,8 +60,123 @@ async def add_user_handler(
             detail=f"Failed to register the user: {e}"
         )
 
+#admin-only endpoint for registering a batch of users
+@router.post("/add-users", status_code=status.HTTP_200_OK, response_model=AuthBulkResult, dependencies=[Depends(require_admin), Depends(rate_limit("add_users", 2, 60))])
+async def add_users_handler(
+    request: UsersBulkAuthRequest,
+    handle: Annotated[RegisterUserHandle, Depends(get_register_user_handle)],
+) -> AuthBulkResult:
+    try:
+        result = await handle.bulk_handle(
+            cmd=UsersBulkRegisteredCommand(
+                users=[
+                    UserRegisteredCommand(username=user.username, password=user.password)
+                    for user in request.users
+                ],
+                return_tokens=request.return_tokens,
+            )
+        )
+        return result
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to register the users: {e}",
+        )
+
+#endpoint for logging in with username and password
+@router.post("/login", status_code=status.HTTP_200_OK, response_model=AuthResult, dependencies=[Depends(rate_limit("login", 10, 60))])
+async def login_handler(
+    request: UserLoginRequest,
+    handle: Annotated[RegisterUserHandle, Depends(get_register_user_handle)],
+) -> AuthResult:
+    try:
+        user = await handle.login_handle(
+            cmd=UserLoginCommand(
+                username=request.username,
+                password=request.password,
+            )
+        )
+        return user
+    except InvalidCredentialsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+        )
+    except HashingOverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to log in: {e}",
+        )
+
+#endpoint exchanging a refresh token (Authorization: Bearer <refresh>) for a new token pair
+@router.post("/refresh", status_code=status.HTTP_200_OK, response_model=AuthResult, dependencies=[Depends(rate_limit("refresh", 30, 60))])
+async def refresh_handler(
+    _: Annotated[HTTPAuthorizationCredentials, Depends(http_bearer)],
+    payload: Annotated[TokenPayload, Depends(get_authx_service().refresh_token_required)],
+    handle: Annotated[RegisterUserHandle, Depends(get_register_user_handle)],
+) -> AuthResult:
+    try:
+        return await handle.refresh_handle(payload)
+    except RefreshTokenReuseError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to refresh the tokens: {e}",
+        )
+
+#endpoint revoking the current access token and, optionally, a refresh token
+@router.post("/logout", status_code=status.HTTP_200_OK, response_model=LogoutResult, dependencies=[Depends(rate_limit("logout", 30, 60, by="user"))])
+async def logout_handler(
+    request: LogoutRequest,
+    _: Annotated[HTTPAuthorizationCredentials, Depends(http_bearer)],
+    payload: Annotated[TokenPayload, Depends(get_authx_service().access_token_required)],
+    handle: Annotated[RegisterUserHandle, Depends(get_register_user_handle)],
+) -> LogoutResult:
+    try:
+        return await handle.logout_handle(payload, refresh_token=request.refresh_token)
+    except (ValueError, AuthXException) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e) or "Invalid refresh token",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to log out: {e}",
+        )
+
+#endpoint for checking whether a username is still free
+@router.get("/username-available", status_code=status.HTTP_200_OK, response_model=UsernameAvailableResult, dependencies=[Depends(rate_limit("username_available", 120, 60))])
+async def username_available_handler(
+    username: str,
+    handle: Annotated[RegisterUserHandle, Depends(get_register_user_handle)],
+) -> UsernameAvailableResult:
+    try:
+        available = await handle.username_available_handle(username)
+        return UsernameAvailableResult(username=username.strip(), available=available)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to check the username: {e}",
+        )
+
 #endpoint for adding a profile
-@router.post("/add-profile", status_code=status.HTTP_201_CREATED, response_model=ProfileAuthResult)
+@router.post("/add-profile", status_code=status.HTTP_201_CREATED, response_model=ProfileAuthResult, dependencies=[Depends(rate_limit("add_profile", 20, 60, by="user"))])
 async def add_profile_handler(
     request: ProfileAuthRequest,
     _: Annotated[HTTPAuthorizationCredentials, Depends(http_bearer)],
@@ -70,8 +204,28 @@ async def add_profile_handler(
             detail=f"Failed to register the profile: {e}",
         )
 
+#endpoint returning the user, their profile and post counts by status in one read
+@router.get("/me", status_code=status.HTTP_200_OK, response_model=MeResult, dependencies=[Depends(rate_limit("me", 120, 60, by="user"))])
+async def me_handler(
+    _: Annotated[HTTPAuthorizationCredentials, Depends(http_bearer)],
+    handle: Annotated[RegisterUserHandle, Depends(get_register_user_handle)],
+    user_id: Annotated[str, Depends(get_current_user_id)],
+) -> MeResult:
+    try:
+        return await handle.me_handle(user_id)
+    except UserNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to load the user: {e}",
+        )
+
 #endpoint for adding a post to the user
-@router.post("/add-post", status_code=status.HTTP_201_CREATED, response_model=PostAuthResult)
+@router.post("/add-post", status_code=status.HTTP_201_CREATED, response_model=PostAuthResult, dependencies=[Depends(rate_limit("add_post", 60, 60, by="user"))])
 async def add_post_handler(
     request: PostAuthRequest,
     handle: Annotated[RegisterUserHandle, Depends(get_register_user_handle)],
@@ -98,16 +252,53 @@ async def add_post_handler(
             detail=f"Failed to register the profile: {e}",
         )
 
+#endpoint for ingesting a batch of posts in chunked transactions
+@router.post("/add-posts", status_code=status.HTTP_200_OK, response_model=PostIngestReport, dependencies=[Depends(rate_limit("add_posts", 6, 60, by="user"))])
+async def add_posts_handler(
+    request: PostsBulkAuthRequest,
+    handle: Annotated[IngestPostsHandle, Depends(get_ingest_posts_handle)],
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    _: Annotated[HTTPAuthorizationCredentials, Depends(http_bearer)],
+) -> PostIngestReport:
+    try:
+        report = await handle.handle(
+            cmd=PostsIngestCommand(
+                posts=(
+                    PostIngestItem(user_id=user_id, title=post.title, content=post.content)
+                    for post in request.posts
+                ),
+                chunk_size=request.chunk_size,
+                resume_from=request.resume_from,
+            )
+        )
+        if report.status == "interrupted":
+            #the body carries the checkpoint the client resumes from
+            return FastJSONResponse(asdict(report), status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return report
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to ingest the posts: {e}",
+        )
+
 #endpoint for receiving user posts by ID
-@router.get("/get-user-posts-by-id", status_code=status.HTTP_200_OK)
+@router.get("/get-user-posts-by-id", status_code=status.HTTP_200_OK, response_model=PostsPage, dependencies=[Depends(rate_limit("get_user_posts", 600, 60, by="user"))])
 async def get_user_posts_by_id_handler(
     repo: Annotated[UserRepository, Depends(get_user_repository)],
     user_id: Annotated[str, Depends(get_current_user_id)],
     _: Annotated[HTTPAuthorizationCredentials, Depends(http_bearer)],
-):
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    cursor: Optional[str] = None,
+    post_status: Annotated[Optional[str], Query(alias="status")] = None,
+) -> FastJSONResponse:
     try:
-        posts = await repo.get_user_post_by_id(user_id)
-        return posts
+        if post_status is not None:
+            post_status = Status(post_status).value
+        posts, next_cursor = await repo.get_user_post_by_id(
+            user_id, limit=limit, cursor=cursor, status=post_status,
+        )
+        #rows are already PostItem-shaped dicts, serialized without a validation pass
+        return FastJSONResponse({"items": posts, "next_cursor": next_cursor})
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -117,4 +308,61 @@ async def get_user_posts_by_id_handler(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to register the profile: {e}",
-        )
\ No newline at end of file
+        )
+
+#endpoint for ranked full-text search over posts; other users' posts only show once published
+@router.get("/search-posts", status_code=status.HTTP_200_OK, response_model=PostSearchPage, dependencies=[Depends(rate_limit("search_posts", 120, 60, by="user"))])
+async def search_posts_handler(
+    repo: Annotated[PostSearchRepository, Depends(get_search_repository)],
+    viewer_id: Annotated[str, Depends(get_current_user_id)],
+    _: Annotated[HTTPAuthorizationCredentials, Depends(http_bearer)],
+    q: Annotated[str, Query(min_length=1, max_length=256)],
+    author: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: Optional[str] = None,
+    post_status: Annotated[Optional[str], Query(alias="status")] = None,
+) -> FastJSONResponse:
+    try:
+        if post_status is not None:
+            post_status = Status(post_status).value
+        hits, next_cursor = await repo.search_posts(
+            q, limit=limit, cursor=cursor, user_id=author, status=post_status, viewer_id=viewer_id,
+        )
+        return FastJSONResponse({"items": hits, "next_cursor": next_cursor})
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search the posts: {e}",
+        )
+
+def _encode_ndjson(chunk: List[Dict[str, Any]]) -> bytes:
+    return b"".join(dumps(post) + b"\n" for post in chunk)
+
+#endpoint streaming the full post history as newline-delimited JSON
+@router.get("/get-user-posts-by-id/stream", status_code=status.HTTP_200_OK, dependencies=[Depends(rate_limit("stream_user_posts", 30, 60, by="user"))])
+async def stream_user_posts_handler(
+    repo: Annotated[UserRepository, Depends(get_user_repository)],
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    _: Annotated[HTTPAuthorizationCredentials, Depends(http_bearer)],
+    chunk_size: Annotated[int, Query(ge=1, le=5000)] = 500,
+    post_status: Annotated[Optional[str], Query(alias="status")] = None,
+) -> StreamingResponse:
+    try:
+        if post_status is not None:
+            post_status = Status(post_status).value
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    async def body() -> AsyncIterator[bytes]:
+        async for chunk in repo.stream_user_posts(user_id, chunk_size=chunk_size, status=post_status):
+            yield _encode_ndjson(chunk)
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
\ No newline at end of file
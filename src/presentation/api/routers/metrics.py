@@ -0,0 +1,114 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from typing import Annotated, Any, Callable, Dict, List, Sequence
+
+from src.infrastructure.metrics.registry import metrics, render_histogram, Gauge, Counter
+from src.infrastructure.messaging.outbox_dispatcher import OutboxDispatcher
+from src.infrastructure.log.logger import DroppingQueueHandler
+from src.presentation.api.deps import (
+    get_argon_config, get_db_config, get_posts_cache, get_authx_service, get_outbox_dispatcher,
+    get_rate_limiter,
+)
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+#scrape-time metrics read the same stats the /system endpoints expose
+def _posts_cache_stats() -> dict:
+    cache = get_posts_cache()
+    return cache.stats() if cache is not None else {}
+
+def _stat_metrics(
+        prefix: str,
+        help: str,
+        stats: Callable[[], Dict[str, Any]],
+        gauges: Sequence[str] = (),
+        counters: Sequence[str] = (),
+) -> List[Gauge]:
+    """One metric per stats field: `<prefix>_<field>` gauges, and `<prefix>_<field>_total` counters
+    for the monotonic totals. A field missing from the stats (e.g. a disabled cache) has no sample"""
+    def sample(field: str) -> Callable[[], List]:
+        return lambda: [({}, value) for value in [stats().get(field)] if value is not None]
+
+    def counter_name(field: str) -> str:
+        return f"{prefix}_{field}" if field.endswith("_total") else f"{prefix}_{field}_total"
+
+    return [
+        *(Gauge(f"{prefix}_{field}", f"{help}: {field}", sample(field)) for field in gauges),
+        *(Counter(counter_name(field), f"{help}: {field}", sample(field)) for field in counters),
+    ]
+
+metrics.gauge(
+    "db_pool_connections", "Connection pool occupancy per engine role",
+    lambda: [
+        ({"role": role, "state": state}, value)
+        for role, pool in get_db_config().pool_stats().items()
+        for state, value in pool.items()
+    ],
+)
+for metric in [
+    *_stat_metrics(
+        "hashing_governor", "Password hashing admission", lambda: get_argon_config().governor.stats(),
+        gauges=("slots", "task_memory_kib", "in_flight", "queue_depth", "max_queue", "wait_seconds_max", "avg_task_seconds"),
+        counters=("admitted_total", "rejected_total", "wait_seconds_total"),
+    ),
+    *_stat_metrics(
+        "posts_cache", "Per-user posts cache", _posts_cache_stats,
+        gauges=("entries", "bytes", "max_bytes", "ttl_seconds"),
+        counters=("hits", "misses", "evictions", "expirations", "invalidations"),
+    ),
+    *_stat_metrics(
+        "token_cache", "Verified JWT payload cache", lambda: get_authx_service().token_cache.stats(),
+        gauges=("entries", "max_entries"),
+        counters=("hits", "misses", "evictions"),
+    ),
+    *_stat_metrics(
+        "token_denylist", "Revoked-token denylist", lambda: get_authx_service().denylist.stats(),
+        gauges=("entries", "heap_size", "sync_interval_seconds"),
+        counters=("revoked_total", "evicted_total", "synced_total"),
+    ),
+    *_stat_metrics(
+        "rate_limiter", "Token-bucket rate limiter", lambda: get_rate_limiter().stats(),
+        gauges=("buckets", "shards"),
+        counters=("allowed_total", "limited_total", "evicted_total"),
+    ),
+]:
+    metrics.add(metric)
+metrics.counter(
+    "log_records_dropped_total", "Log records dropped because the log queue was full",
+    lambda: [({}, DroppingQueueHandler.dropped)],
+)
+
+def _group_commit_lines() -> List[str]:
+    group_commit = get_db_config().group_commit
+    if group_commit is None:
+        return []
+    return [
+        "# TYPE db_group_commit_batch_size histogram",
+        *render_histogram("db_group_commit_batch_size", group_commit.batch_size),
+        "# TYPE db_group_commit_wait_seconds histogram",
+        *render_histogram("db_group_commit_wait_seconds", group_commit.wait_seconds),
+    ]
+
+metrics.add_renderer(_group_commit_lines)
+
+#Prometheus text exposition of every registered metric
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics_handler(
+    dispatcher: Annotated[OutboxDispatcher, Depends(get_outbox_dispatcher)],
+) -> PlainTextResponse:
+    #the outbox backlog needs a query, so it is collected here rather than in a sync gauge
+    outbox = await dispatcher.stats()
+    outbox_lines = [
+        line
+        for metric in _stat_metrics(
+            "outbox", "Transactional outbox", lambda: outbox,
+            gauges=("pending", "dead_lettered", "oldest_pending_age_seconds", "last_lag_seconds", "last_batch_seconds"),
+            counters=("dispatched_total", "failed_total"),
+        )
+        for line in metric.render()
+    ]
+    body = metrics.render() + "\n".join(outbox_lines) + "\n"
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
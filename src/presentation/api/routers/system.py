@@ -0,0 +1,79 @@
+from fastapi import APIRouter, status, Depends, Response
+
+from typing import Annotated, Optional
+
+from src.infrastructure.security.argon_config import ArgonHashConfig
+from src.infrastructure.db.session import DataBaseConfig
+from src.infrastructure.cache.backend import CacheBackendProtocol
+from src.infrastructure.security.authx_config import AuthxService
+from src.infrastructure.messaging.outbox_dispatcher import OutboxDispatcher
+from src.infrastructure.lifecycle.readiness import Readiness
+from src.infrastructure.ratelimit.token_bucket import TokenBucketLimiter
+from src.presentation.api.deps import get_argon_config, get_db_config, get_posts_cache, get_authx_service, get_outbox_dispatcher, get_readiness, get_rate_limiter
+
+router = APIRouter(
+    prefix="/system"
+)
+
+#readiness probe: 503 until every startup phase has finished, and again while draining
+@router.get("/ready", status_code=status.HTTP_200_OK)
+async def readiness_handler(
+    response: Response,
+    readiness: Annotated[Readiness, Depends(get_readiness)],
+) -> dict:
+    if not readiness.is_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness.snapshot()
+
+#endpoint exposing the password hashing admission stats
+@router.get("/hashing", status_code=status.HTTP_200_OK)
+async def hashing_stats_handler(
+    hasher: Annotated[ArgonHashConfig, Depends(get_argon_config)],
+) -> dict:
+    return hasher.governor.stats()
+
+#endpoint exposing the group commit batch-size and wait-time histograms
+@router.get("/group-commit", status_code=status.HTTP_200_OK)
+async def group_commit_stats_handler(
+    db: Annotated[DataBaseConfig, Depends(get_db_config)],
+) -> dict:
+    if db.group_commit is None:
+        return {"enabled": False}
+    return {"enabled": True, **db.group_commit.stats()}
+
+#endpoint exposing the posts cache hit/miss/eviction counters
+@router.get("/posts-cache", status_code=status.HTTP_200_OK)
+async def posts_cache_stats_handler(
+    cache: Annotated[Optional[CacheBackendProtocol], Depends(get_posts_cache)],
+) -> dict:
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+#endpoint exposing the verified-token cache counters
+@router.get("/token-cache", status_code=status.HTTP_200_OK)
+async def token_cache_stats_handler(
+    authx: Annotated[AuthxService, Depends(get_authx_service)],
+) -> dict:
+    return authx.token_cache.stats()
+
+#endpoint exposing the revoked-token denylist size and eviction counters
+@router.get("/token-denylist", status_code=status.HTTP_200_OK)
+async def token_denylist_stats_handler(
+    authx: Annotated[AuthxService, Depends(get_authx_service)],
+) -> dict:
+    return authx.denylist.stats()
+
+#endpoint exposing the rate limiter bucket counts and decisions
+@router.get("/rate-limit", status_code=status.HTTP_200_OK)
+async def rate_limit_stats_handler(
+    limiter: Annotated[TokenBucketLimiter, Depends(get_rate_limiter)],
+) -> dict:
+    return limiter.stats()
+
+#endpoint exposing the outbox backlog and dispatch lag
+@router.get("/outbox", status_code=status.HTTP_200_OK)
+async def outbox_stats_handler(
+    dispatcher: Annotated[OutboxDispatcher, Depends(get_outbox_dispatcher)],
+) -> dict:
+    return await dispatcher.stats()
\ No newline at end of file
@@ -1,14 +1,51 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict
+from datetime import datetime
 
 class AuthResult(BaseModel):
     status: str
     message: str
     access_token: str
+    refresh_token: Optional[str] = None
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+class LogoutResult(BaseModel):
+    status: str
+    message: str
+    revoked: int
 
 class UserAuthRequest(BaseModel):
     username: str
     password: str
 
+class UsersBulkAuthRequest(BaseModel):
+    users: List[UserAuthRequest] = Field(min_length=1, max_length=100)
+    return_tokens: bool = False
+
+class AuthBulkRowResult(BaseModel):
+    index: int
+    username: str
+    status: str
+    message: str
+    user_id: Optional[str] = None
+    access_token: Optional[str] = None
+
+class AuthBulkResult(BaseModel):
+    status: str
+    created: int
+    failed: int
+    results: List[AuthBulkRowResult]
+
+class UserLoginRequest(BaseModel):
+    username: str
+    password: str
+
+class UsernameAvailableResult(BaseModel):
+    username: str
+    available: bool
+
 class ProfileAuthRequest(BaseModel):
     age: int
     name: str
@@ -18,6 +55,19 @@ class ProfileAuthResult(BaseModel):
     status: str
     message: str
 
+class ProfileItem(BaseModel):
+    age: int
+    name: str
+    city: str
+
+class MeResult(BaseModel):
+    user_id: str
+    username: str
+    created_at: datetime
+    profile: Optional[ProfileItem] = None
+    post_counts: Dict[str, int]
+    posts_total: int
+
 class PostAuthRequest(BaseModel):
     title: str
     content: str
@@ -26,5 +76,52 @@ class PostAuthResult(BaseModel):
     status: str
     message: str
 
+class PostsBulkAuthRequest(BaseModel):
+    posts: List[PostAuthRequest] = Field(min_length=1, max_length=100000)
+    chunk_size: int = Field(default=1000, ge=1, le=5000)
+    resume_from: int = Field(default=0, ge=0)
+
+class PostIngestError(BaseModel):
+    index: int
+    message: str
+
+class PostIngestReport(BaseModel):
+    status: str
+    processed: int
+    inserted: int
+    rejected: int
+    chunks: int
+    checkpoint: int
+    elapsed_seconds: float
+    rows_per_second: float
+    errors: List[PostIngestError]
+    message: Optional[str] = None
+
 class GetPostsByID(BaseModel):
-    user_id: str
\ No newline at end of file
+    user_id: str
+
+class PostItem(BaseModel):
+    post_id: str
+    user_id: str
+    title: str
+    content: str
+    status: str
+    created_at: datetime
+
+class PostsPage(BaseModel):
+    items: List[PostItem]
+    next_cursor: Optional[str] = None
+
+class PostSearchHit(BaseModel):
+    post_id: str
+    user_id: str
+    title: str
+    status: str
+    created_at: datetime
+    score: float
+    title_highlight: str
+    snippet: str
+
+class PostSearchPage(BaseModel):
+    items: List[PostSearchHit]
+    next_cursor: Optional[str] = None
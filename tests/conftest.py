@@ -0,0 +1,36 @@
+import os
+import tempfile
+
+import pytest
+
+#the deps.py singletons read the environment on first use, so it is set before src is imported
+_WORKDIR = tempfile.mkdtemp(prefix="tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite+aiosqlite:///{os.path.join(_WORKDIR, 'test.db')}",
+    ARGON_TIME_COST="1",
+    ARGON_MEMORY_COST="8",
+    ARGON_PARALLELISM="1",
+    ARGON_MAX_WORKERS="1",
+    RATE_LIMIT_ENABLED="0",
+    LOG_LEVEL="WARNING",
+)
+
+from fastapi.testclient import TestClient
+
+from src.app.main import app
+
+_usernames = (f"test{os.getpid() % 1000:03d}{i:05d}" for i in range(100_000))
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+@pytest.fixture
+def register(client):
+    """Register a fresh user and return its token pair"""
+    def _register() -> dict:
+        response = client.post("/auth/add-user", json={"username": next(_usernames), "password": "secret123"})
+        assert response.status_code == 201, response.text
+        return response.json()
+    return _register
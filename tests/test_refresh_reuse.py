@@ -0,0 +1,17 @@
+def _bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+def test_refresh_reuse_revokes_registration_access_token(client, register):
+    tokens = register()
+    assert client.get("/auth/me", headers=_bearer(tokens["access_token"])).status_code == 200
+
+    first = client.post("/auth/refresh", headers=_bearer(tokens["refresh_token"]))
+    assert first.status_code == 200
+
+    reused = client.post("/auth/refresh", headers=_bearer(tokens["refresh_token"]))
+    assert reused.status_code == 401
+
+    #the whole family is gone: the pair from registration and the pair from the first refresh
+    assert client.get("/auth/me", headers=_bearer(tokens["access_token"])).status_code == 401
+    assert client.get("/auth/me", headers=_bearer(first.json()["access_token"])).status_code == 401
+    assert client.post("/auth/refresh", headers=_bearer(first.json()["refresh_token"])).status_code == 401
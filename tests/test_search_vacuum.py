@@ -0,0 +1,34 @@
+import os
+import sqlite3
+
+from sqlalchemy.engine import make_url
+
+def _bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+def test_search_hits_keep_their_post_after_vacuum(client, register):
+    headers = _bearer(register()["access_token"])
+    for n in range(6):
+        response = client.post(
+            "/auth/add-post", json={"title": f"zephyr post {n}", "content": f"vacuum check number{n}"}, headers=headers,
+        )
+        assert response.status_code == 201, response.text
+    posts = client.get("/auth/get-user-posts-by-id", params={"limit": 20}, headers=headers).json()["items"]
+    post_ids = {post["title"]: post["post_id"] for post in posts}
+
+    #deleting the oldest rows leaves a gap that VACUUM may close by renumbering implicit rowids
+    conn = sqlite3.connect(make_url(os.environ["DATABASE_URL"]).database, isolation_level=None)
+    try:
+        deleted = [post_ids[f"zephyr post {n}"] for n in range(3)]
+        conn.execute("DELETE FROM posts WHERE post_id IN (?, ?, ?)", deleted)
+        conn.execute("VACUUM")
+        #the index is keyed on posts.id, which VACUUM keeps only because it aliases the rowid
+        assert conn.execute("SELECT count(*) FROM posts WHERE id IS NOT rowid").fetchone() == (0,)
+    finally:
+        conn.close()
+
+    hits = client.get("/auth/search-posts", params={"q": "zephyr"}, headers=headers).json()["items"]
+    assert sorted(hit["title"] for hit in hits) == ["zephyr post 3", "zephyr post 4", "zephyr post 5"]
+    for hit in hits:
+        assert hit["post_id"] == post_ids[hit["title"]]
+        assert f"number{hit['title'][-1]}" in hit["snippet"]